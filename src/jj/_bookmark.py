@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ._parsing import BOOKMARK_TEMPLATE, parse_bookmarks
 from ._runner import Runner
 from .models import Bookmark
 
@@ -12,68 +13,66 @@ class BookmarkManager:
 
     async def list(self, *, all_remotes: bool = False) -> list[Bookmark]:
         """List bookmarks."""
-        args = ["bookmark", "list"]
-        if all_remotes:
-            args.append("--all-remotes")
-        result = await self._runner.run(args)
-        bookmarks: list[Bookmark] = []
-        for line in result.stdout.strip().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            # Lines look like: "name: change_id commit_id" or "name (deleted)"
-            # or "name@remote: ..."
-            name = line.split(":")[0].strip()
-            present = "(deleted)" not in line
-            tracking = None
-            if "@" in name:
-                name_part, _, remote = name.partition("@")
-                tracking = remote
-                name = name_part
-            bookmarks.append(Bookmark(name=name, present=present, tracking=tracking))
-        return bookmarks
+        args = [
+            "bookmark",
+            "list",
+            "-T",
+            BOOKMARK_TEMPLATE,
+            *(("--all-remotes",) if all_remotes else ()),
+        ]
+        result = await self._runner.run(args, read_only=True)
+        return parse_bookmarks(result.stdout)
 
     async def create(self, name: str, *, revision: str | None = None) -> None:
         """Create a new bookmark."""
-        args = ["bookmark", "create", name]
-        if revision is not None:
-            args.extend(["-r", revision])
-        await self._runner.run(args)
+        args = [
+            "bookmark",
+            "create",
+            name,
+            *(("-r", revision) if revision is not None else ()),
+        ]
+        await self._runner.run(args, capture_stdout=False)
 
     async def delete(self, *names: str) -> None:
         """Delete bookmarks."""
-        args = ["bookmark", "delete"]
-        args.extend(names)
-        await self._runner.run(args)
+        await self._runner.run(["bookmark", "delete", *names], capture_stdout=False)
 
     async def forget(self, *names: str) -> None:
         """Forget bookmarks (remove local and remote tracking)."""
-        args = ["bookmark", "forget"]
-        args.extend(names)
-        await self._runner.run(args)
+        await self._runner.run(["bookmark", "forget", *names], capture_stdout=False)
 
     async def move(self, name: str, *, to: str | None = None) -> None:
         """Move a bookmark to a different revision."""
-        args = ["bookmark", "move", name]
-        if to is not None:
-            args.extend(["--to", to])
-        await self._runner.run(args)
+        args = [
+            "bookmark",
+            "move",
+            name,
+            *(("--to", to) if to is not None else ()),
+        ]
+        await self._runner.run(args, capture_stdout=False)
 
     async def set(self, name: str, *, revision: str | None = None) -> None:
         """Set a bookmark (create or move)."""
-        args = ["bookmark", "set", name]
-        if revision is not None:
-            args.extend(["-r", revision])
-        await self._runner.run(args)
+        args = [
+            "bookmark",
+            "set",
+            name,
+            *(("-r", revision) if revision is not None else ()),
+        ]
+        await self._runner.run(args, capture_stdout=False)
 
     async def rename(self, old: str, new: str) -> None:
         """Rename a bookmark."""
-        await self._runner.run(["bookmark", "rename", old, new])
+        await self._runner.run(["bookmark", "rename", old, new], capture_stdout=False)
 
     async def track(self, bookmark: str, *, remote: str = "origin") -> None:
         """Start tracking a remote bookmark."""
-        await self._runner.run(["bookmark", "track", f"{bookmark}@{remote}"])
+        await self._runner.run(
+            ["bookmark", "track", f"{bookmark}@{remote}"], capture_stdout=False
+        )
 
     async def untrack(self, bookmark: str, *, remote: str = "origin") -> None:
         """Stop tracking a remote bookmark."""
-        await self._runner.run(["bookmark", "untrack", f"{bookmark}@{remote}"])
+        await self._runner.run(
+            ["bookmark", "untrack", f"{bookmark}@{remote}"], capture_stdout=False
+        )
@@ -1,7 +1,41 @@
 from __future__ import annotations
 
 import asyncio
+import shlex
 import subprocess
+import uuid
+from contextlib import suppress
+
+from ._executor import LineCallback, drain_lines
+
+_READ_CHUNK = 65536
+
+
+class _FrameReader:
+    """Reads sentinel-delimited frames from a long-lived shell's output stream."""
+
+    def __init__(self, stream: asyncio.StreamReader) -> None:
+        self._stream = stream
+        self._buf = bytearray()
+
+    async def read_frame(self, sentinel: bytes) -> bytes:
+        start = 0
+        while (idx := self._buf.find(sentinel, start)) == -1:
+            # The sentinel may straddle two chunks, so re-scan its width
+            start = max(0, len(self._buf) - len(sentinel) + 1)
+            chunk = await self._stream.read(_READ_CHUNK)
+            if not chunk:
+                raise EOFError
+            self._buf += chunk
+        frame = bytes(self._buf[:idx])
+        del self._buf[: idx + len(sentinel)]
+        return frame
+
+    async def read_rest(self) -> bytes:
+        """Return everything not yet framed, reading the stream to EOF."""
+        rest = bytes(self._buf) + await self._stream.read()
+        self._buf.clear()
+        return rest
 
 
 class DockerExecutor:
@@ -23,6 +57,16 @@ class DockerExecutor:
         # ... use executor ...
         await executor.stop()
 
+    By default commands are dispatched through one long-lived ``sh`` process
+    inside the container (``docker exec -i <container> sh``), so each command
+    costs a write to the shell's stdin rather than a fresh ``docker exec``.
+    This needs ``sh`` and ``printf`` in the image; pass ``persistent=False`` to
+    spawn one ``docker exec`` per command instead. If the shell dies (container
+    stopped, no ``sh``, OOM) the command it was running fails with docker's
+    exit status and stderr, and the next command starts a new shell.
+    :meth:`stream` always uses its own ``docker exec``, so a consumer that
+    pauses its output never holds up the shell other commands are queued on.
+
     Use as an async context manager (auto-stops)::
 
         async with await DockerExecutor.start(image="my-jj-image") as executor:
@@ -38,6 +82,7 @@ class DockerExecutor:
         user: str | None = None,
         env: dict[str, str] | None = None,
         docker_path: str = "docker",
+        persistent: bool = True,
         _owns_container: bool = False,
     ) -> None:
         self.container = container
@@ -45,7 +90,21 @@ class DockerExecutor:
         self.user = user
         self.env = env or {}
         self.docker_path = docker_path
+        self.persistent = persistent
         self._owns_container = _owns_container
+        # The exec options never change, so render them once
+        self._exec_prefix: tuple[str, ...] = (
+            docker_path,
+            "exec",
+            *(("-w", workdir) if workdir is not None else ()),
+            *(("-u", user) if user is not None else ()),
+            *(arg for k, v in self.env.items() for arg in ("-e", f"{k}={v}")),
+        )
+        self._sentinel = f"<<JJ_EXEC_{uuid.uuid4().hex}>>"
+        self._shell: asyncio.subprocess.Process | None = None
+        self._shell_stdout: _FrameReader | None = None
+        self._shell_stderr: _FrameReader | None = None
+        self._shell_lock = asyncio.Lock()
 
     @classmethod
     async def start(
@@ -58,21 +117,24 @@ class DockerExecutor:
         volumes: dict[str, str] | None = None,
         ports: dict[int, int] | None = None,
         docker_path: str = "docker",
+        persistent: bool = True,
     ) -> DockerExecutor:
         """Start a new container from *image* and return an executor attached to it."""
-        cmd = [docker_path, "run", "-d", "--rm"]
-        if workdir is not None:
-            cmd.extend(["-w", workdir])
-        if user is not None:
-            cmd.extend(["-u", user])
-        for key, value in (env or {}).items():
-            cmd.extend(["-e", f"{key}={value}"])
-        for host_path, container_path in (volumes or {}).items():
-            cmd.extend(["-v", f"{host_path}:{container_path}"])
-        for host_port, container_port in (ports or {}).items():
-            cmd.extend(["-p", f"{host_port}:{container_port}"])
-        # Keep the container alive with a long sleep
-        cmd.extend([image, "sleep", "infinity"])
+        cmd = [
+            docker_path,
+            "run",
+            "-d",
+            "--rm",
+            *(("-w", workdir) if workdir is not None else ()),
+            *(("-u", user) if user is not None else ()),
+            *(arg for k, v in (env or {}).items() for arg in ("-e", f"{k}={v}")),
+            *(arg for h, c in (volumes or {}).items() for arg in ("-v", f"{h}:{c}")),
+            *(arg for h, c in (ports or {}).items() for arg in ("-p", f"{h}:{c}")),
+            # Keep the container alive with a long sleep
+            image,
+            "sleep",
+            "infinity",
+        ]
 
         proc = await asyncio.create_subprocess_exec(
             *cmd,
@@ -92,16 +154,25 @@ class DockerExecutor:
             user=user,
             env=env,
             docker_path=docker_path,
+            persistent=persistent,
             _owns_container=True,
         )
 
     async def stop(self) -> None:
-        """Stop and remove the container (only if we started it)."""
+        """Close the persistent shell, then stop and remove the container.
+
+        The container is only stopped if we started it.
+        """
+        await self._close_shell()
         if not self._owns_container:
             return
+        # The container's only process is ``sleep infinity`` as PID 1, which
+        # ignores SIGTERM, so the default grace period is pure waiting
         proc = await asyncio.create_subprocess_exec(
             self.docker_path,
             "stop",
+            "--time",
+            "0",
             self.container,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
@@ -109,23 +180,196 @@ class DockerExecutor:
         await proc.communicate()
         self._owns_container = False
 
-    async def execute(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
-        docker_cmd = [self.docker_path, "exec"]
-        if self.workdir is not None:
-            docker_cmd.extend(["-w", self.workdir])
-        if self.user is not None:
-            docker_cmd.extend(["-u", self.user])
-        for key, value in self.env.items():
-            docker_cmd.extend(["-e", f"{key}={value}"])
-        docker_cmd.append(self.container)
-        docker_cmd.extend(cmd)
+    def _exec_cmd(self, cmd: list[str], *, interactive: bool = False) -> list[str]:
+        return [
+            *self._exec_prefix,
+            *(("-i",) if interactive else ()),
+            self.container,
+            *cmd,
+        ]
+
+    def _framed(self, cmd: list[str], capture_stdout: bool = True) -> str:
+        """Shell line running *cmd*, then emitting its exit status and sentinels.
+
+        stdout gets ``<output><sentinel>``; stderr gets
+        ``<output><sentinel><status><sentinel>``. Without *capture_stdout* the
+        command's stdout goes to ``/dev/null`` and its frame is empty.
+        """
+        sentinel = shlex.quote(self._sentinel)
+        redirect = "" if capture_stdout else " >/dev/null"
+        return (
+            f"{shlex.join(cmd)} </dev/null{redirect}; "
+            f"printf '%s%s%s' {sentinel} \"$?\" {sentinel} >&2; "
+            f"printf '%s' {sentinel}\n"
+        )
+
+    async def _ensure_shell(self) -> asyncio.subprocess.Process:
+        if self._shell is None or self._shell.returncode is not None:
+            self._shell = await asyncio.create_subprocess_exec(
+                *self._exec_cmd(["sh"], interactive=True),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            assert self._shell.stdout is not None
+            assert self._shell.stderr is not None
+            self._shell_stdout = _FrameReader(self._shell.stdout)
+            self._shell_stderr = _FrameReader(self._shell.stderr)
+        return self._shell
+
+    async def _close_shell(self) -> None:
+        shell, self._shell = self._shell, None
+        if shell is None or shell.returncode is not None:
+            return
+        assert shell.stdin is not None
+        shell.stdin.close()
+        try:
+            await asyncio.wait_for(shell.wait(), timeout=5)
+        except TimeoutError:
+            shell.kill()
+            await shell.wait()
+
+    async def _kill_shell(self) -> None:
+        shell, self._shell = self._shell, None
+        if shell is not None and shell.returncode is None:
+            shell.kill()
+            await shell.wait()
+
+    async def _reap_shell(self) -> tuple[int, str]:
+        """Collect the exit status and unread stderr of a shell that died."""
+        shell, self._shell = self._shell, None
+        assert shell is not None
+        assert self._shell_stderr is not None
+        err = b""
+        with suppress(TimeoutError):
+            err = await asyncio.wait_for(self._shell_stderr.read_rest(), timeout=5)
+        if shell.returncode is None:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(shell.wait(), timeout=5)
+        if shell.returncode is None:
+            shell.kill()
+            await shell.wait()
+        return shell.returncode or 1, err.decode()
+
+    async def _read_result(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        assert self._shell_stdout is not None
+        assert self._shell_stderr is not None
+        sentinel = self._sentinel.encode()
+
+        async def read_stderr() -> tuple[bytes, bytes]:
+            assert self._shell_stderr is not None
+            err = await self._shell_stderr.read_frame(sentinel)
+            status = await self._shell_stderr.read_frame(sentinel)
+            return err, status
+
+        # Drain both pipes together so a full stderr can't block stdout. Let
+        # both finish before raising, so neither is left reading a dead shell
+        out, err_status = await asyncio.gather(
+            self._shell_stdout.read_frame(sentinel),
+            read_stderr(),
+            return_exceptions=True,
+        )
+        if isinstance(out, BaseException):
+            raise out
+        if isinstance(err_status, BaseException):
+            raise err_status
+        err, status = err_status
+        return subprocess.CompletedProcess(
+            args=cmd,
+            returncode=int(status),
+            stdout=out.decode(),
+            stderr=err.decode(),
+        )
+
+    async def _dispatch(
+        self,
+        cmds: list[list[str]],
+        capture_stdout: bool = True,
+    ) -> list[subprocess.CompletedProcess[str]]:
+        """Send *cmds* to the persistent shell in one write and collect results."""
+        async with self._shell_lock:
+            shell = await self._ensure_shell()
+            assert shell.stdin is not None
+            results: list[subprocess.CompletedProcess[str]] = []
+            try:
+                shell.stdin.write(
+                    "".join(self._framed(cmd, capture_stdout) for cmd in cmds).encode()
+                )
+                await shell.stdin.drain()
+                for cmd in cmds:
+                    results.append(await self._read_result(cmd))
+                return results
+            except (EOFError, ConnectionError):
+                # The shell died; whatever docker printed explains why, so
+                # report it as the failure of the command that was running
+                returncode, stderr = await self._reap_shell()
+                return results + [
+                    subprocess.CompletedProcess(
+                        cmd, returncode, "", stderr if i == 0 else ""
+                    )
+                    for i, cmd in enumerate(cmds[len(results) :])
+                ]
+            except BaseException:
+                # A half-read frame would desynchronise every later command, and
+                # a command left running may be blocked on output nobody reads
+                await self._kill_shell()
+                raise
+
+    async def execute(
+        self, cmd: list[str], *, capture_stdout: bool = True
+    ) -> subprocess.CompletedProcess[str]:
+        if self.persistent:
+            (result,) = await self._dispatch([cmd], capture_stdout=capture_stdout)
+            return result
 
         proc = await asyncio.create_subprocess_exec(
-            *docker_cmd,
-            stdout=asyncio.subprocess.PIPE,
+            *self._exec_cmd(cmd),
+            stdout=asyncio.subprocess.PIPE
+            if capture_stdout
+            else asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
         stdout_bytes, stderr_bytes = await proc.communicate()
+        return subprocess.CompletedProcess(
+            args=cmd,
+            returncode=proc.returncode or 0,
+            stdout=stdout_bytes.decode() if stdout_bytes is not None else "",
+            stderr=stderr_bytes.decode(),
+        )
+
+    async def execute_quiet(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        """Like :meth:`execute`, but discard stdout; ``result.stdout`` is empty."""
+        return await self.execute(cmd, capture_stdout=False)
+
+    async def stream(
+        self,
+        cmd: list[str],
+        *,
+        on_stdout_line: LineCallback | None = None,
+        on_stderr_line: LineCallback | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        """Like :meth:`execute`, but report output lines while *cmd* runs.
+
+        Runs in a separate ``docker exec`` even in persistent mode, so a slow
+        line callback never blocks other commands.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *self._exec_cmd(cmd),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert proc.stdout is not None
+        assert proc.stderr is not None
+        try:
+            stdout_bytes, stderr_bytes = await asyncio.gather(
+                drain_lines(proc.stdout, on_stdout_line),
+                drain_lines(proc.stderr, on_stderr_line),
+            )
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
         return subprocess.CompletedProcess(
             args=cmd,
             returncode=proc.returncode or 0,
@@ -133,6 +377,46 @@ class DockerExecutor:
             stderr=stderr_bytes.decode(),
         )
 
+    async def execute_many(
+        self, cmds: list[list[str]]
+    ) -> list[subprocess.CompletedProcess[str]]:
+        """Execute *cmds* sequentially in a single round-trip.
+
+        With the persistent shell, every command is written in one go and the
+        results read back frame by frame. Otherwise the commands run in one
+        ``docker exec ... sh -c`` script whose output is split on the sentinels.
+        """
+        if not cmds:
+            return []
+        if self.persistent:
+            return await self._dispatch(cmds)
+
+        proc = await asyncio.create_subprocess_exec(
+            *self._exec_cmd(["sh", "-c", "".join(map(self._framed, cmds))]),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout_bytes, stderr_bytes = await proc.communicate()
+        stdouts = stdout_bytes.decode().split(self._sentinel)
+        # stderr alternates: <stderr>, <exit status>, <stderr>, <exit status>, ...
+        stderrs = stderr_bytes.decode().split(self._sentinel)
+
+        results: list[subprocess.CompletedProcess[str]] = []
+        for i, cmd in enumerate(cmds):
+            # Missing frames mean the shell died before finishing this command
+            finished = 2 * i + 1 < len(stderrs)
+            results.append(
+                subprocess.CompletedProcess(
+                    args=cmd,
+                    returncode=int(stderrs[2 * i + 1])
+                    if finished
+                    else proc.returncode or 1,
+                    stdout=stdouts[i] if i < len(stdouts) else "",
+                    stderr=stderrs[2 * i] if 2 * i < len(stderrs) else "",
+                )
+            )
+        return results
+
     async def __aenter__(self) -> DockerExecutor:
         return self
 
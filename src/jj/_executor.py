@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import subprocess
+from collections.abc import Awaitable, Callable
 from typing import Protocol, runtime_checkable
 
+_READ_CHUNK = 65536
+
+# May return an awaitable, which is awaited before more output is read
+LineCallback = Callable[[str], Awaitable[None] | None]
+
 
 @runtime_checkable
 class Executor(Protocol):
@@ -11,6 +17,15 @@ class Executor(Protocol):
 
     Implement this to run jj commands in a sandbox (Docker, nsjail, etc.)
     instead of directly via local subprocess.
+
+    Executors may additionally provide ``execute_many(cmds)`` to run a batch
+    in order in one round-trip, and
+    ``stream(cmd, on_stdout_line=..., on_stderr_line=...)`` to report output
+    lines as they arrive; the Runner uses them when present. ``stream`` must
+    await whatever a line callback returns, so slow consumers can pause the
+    command, and must stop the command if it is cancelled.
+    An ``execute_quiet(cmd)`` that discards stdout is used for commands
+    whose output the Runner ignores.
     """
 
     async def execute(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
@@ -18,16 +33,90 @@ class Executor(Protocol):
         ...
 
 
+async def drain_lines(
+    stream: asyncio.StreamReader, on_line: LineCallback | None = None
+) -> bytes:
+    """Read *stream* to EOF, calling *on_line* for each line as it completes.
+
+    Lines are passed without their trailing newline. Reads are chunked rather
+    than line-based so that very long lines can't overrun the reader's limit.
+    If *on_line* returns an awaitable, reading resumes once it completes.
+    """
+    buf = bytearray()
+    line_start = 0
+    while chunk := await stream.read(_READ_CHUNK):
+        scan_from = len(buf)
+        buf += chunk
+        if on_line is None:
+            continue
+        while (newline := buf.find(b"\n", scan_from)) != -1:
+            if (pending := on_line(buf[line_start:newline].decode())) is not None:
+                await pending
+            line_start = scan_from = newline + 1
+    if (
+        on_line is not None
+        and line_start < len(buf)
+        and (pending := on_line(buf[line_start:].decode())) is not None
+    ):
+        await pending
+    return bytes(buf)
+
+
 class LocalExecutor:
     """Default executor — runs commands via local async subprocess."""
 
-    async def execute(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
+    async def execute(
+        self, cmd: list[str], *, capture_stdout: bool = True
+    ) -> subprocess.CompletedProcess[str]:
         proc = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE
+            if capture_stdout
+            else asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
         stdout_bytes, stderr_bytes = await proc.communicate()
+        return subprocess.CompletedProcess(
+            args=cmd,
+            returncode=proc.returncode or 0,
+            stdout=stdout_bytes.decode() if stdout_bytes is not None else "",
+            stderr=stderr_bytes.decode(),
+        )
+
+    async def execute_quiet(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
+        """Like :meth:`execute`, but discard stdout; ``result.stdout`` is empty."""
+        return await self.execute(cmd, capture_stdout=False)
+
+    async def stream(
+        self,
+        cmd: list[str],
+        *,
+        on_stdout_line: LineCallback | None = None,
+        on_stderr_line: LineCallback | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        """Like :meth:`execute`, but report output lines while *cmd* runs.
+
+        If the call is cancelled (e.g. an iterator over the output is
+        abandoned), the process is killed and reaped before this returns.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert proc.stdout is not None
+        assert proc.stderr is not None
+        try:
+            # Drain both pipes together so neither can fill up and stall the child
+            stdout_bytes, stderr_bytes = await asyncio.gather(
+                drain_lines(proc.stdout, on_stdout_line),
+                drain_lines(proc.stderr, on_stderr_line),
+            )
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
         return subprocess.CompletedProcess(
             args=cmd,
             returncode=proc.returncode or 0,
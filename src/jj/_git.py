@@ -16,6 +16,7 @@ class GitManager:
 
     def __init__(self, runner: Runner) -> None:
         self._runner = runner
+        self._root: str | None = None
 
     async def push(
         self,
@@ -26,15 +27,14 @@ class GitManager:
         change: str | None = None,
     ) -> str:
         """Push to a git remote. Returns command output."""
-        args = ["git", "push"]
-        if remote is not None:
-            args.extend(["--remote", remote])
-        if bookmark is not None:
-            args.extend(["-b", bookmark])
-        if all_bookmarks:
-            args.append("--all")
-        if change is not None:
-            args.extend(["-c", change])
+        args = [
+            "git",
+            "push",
+            *(("--remote", remote) if remote is not None else ()),
+            *(("-b", bookmark) if bookmark is not None else ()),
+            *(("--all",) if all_bookmarks else ()),
+            *(("-c", change) if change is not None else ()),
+        ]
         result = await self._runner.run(args)
         return result.stderr + result.stdout
 
@@ -45,11 +45,12 @@ class GitManager:
         all_remotes: bool = False,
     ) -> str:
         """Fetch from a git remote. Returns command output."""
-        args = ["git", "fetch"]
-        if remote is not None:
-            args.extend(["--remote", remote])
-        if all_remotes:
-            args.append("--all-remotes")
+        args = [
+            "git",
+            "fetch",
+            *(("--remote", remote) if remote is not None else ()),
+            *(("--all-remotes",) if all_remotes else ()),
+        ]
         result = await self._runner.run(args)
         return result.stderr + result.stdout
 
@@ -70,59 +71,68 @@ class GitManager:
             args.append(str(destination))
         await runner.run(args)
 
-        if destination is not None:
-            clone_path = Path(destination)
-        else:
-            name = url.rstrip("/").rsplit("/", 1)[-1]
-            if name.endswith(".git"):
-                name = name[:-4]
-            clone_path = Path(name)
+        if destination is None:
+            destination = url.rstrip("/").rsplit("/", 1)[-1]
+            if destination.endswith(".git"):
+                destination = destination[:-4]
 
-        return Repo(clone_path, jj_path=jj_path, executor=executor)
+        return Repo(destination, jj_path=jj_path, executor=executor)
 
     async def remote_add(self, name: str, url: str) -> None:
         """Add a git remote."""
-        await self._runner.run(["git", "remote", "add", name, url])
+        await self._runner.run(
+            ["git", "remote", "add", name, url], capture_stdout=False
+        )
 
     async def remote_remove(self, name: str) -> None:
         """Remove a git remote."""
-        await self._runner.run(["git", "remote", "remove", name])
+        await self._runner.run(["git", "remote", "remove", name], capture_stdout=False)
 
     async def remote_rename(self, old: str, new: str) -> None:
         """Rename a git remote."""
-        await self._runner.run(["git", "remote", "rename", old, new])
+        await self._runner.run(
+            ["git", "remote", "rename", old, new], capture_stdout=False
+        )
 
     async def remote_list(self) -> dict[str, str]:
         """List git remotes. Returns {name: url}."""
-        result = await self._runner.run(["git", "remote", "list"])
-        remotes: dict[str, str] = {}
-        for line in result.stdout.strip().splitlines():
-            if not line.strip():
-                continue
-            parts = line.split(None, 1)
-            if len(parts) == 2:
-                remotes[parts[0]] = parts[1]
-            elif len(parts) == 1:
-                remotes[parts[0]] = ""
-        return remotes
+        result = await self._runner.run(["git", "remote", "list"], read_only=True)
+        # Each line is "<name> <url>"
+        return {
+            name: url
+            for name, _, url in (
+                line.partition(" ") for line in result.stdout.splitlines()
+            )
+            if name
+        }
 
     async def remote_set_url(self, name: str, url: str) -> None:
         """Set the URL of a git remote."""
-        await self._runner.run(["git", "remote", "set-url", name, url])
+        await self._runner.run(
+            ["git", "remote", "set-url", name, url], capture_stdout=False
+        )
 
     async def export(self) -> None:
         """Export jj refs to the underlying git repo."""
-        await self._runner.run(["git", "export"])
+        await self._runner.run(["git", "export"], capture_stdout=False)
 
     async def import_(self) -> None:
         """Import git refs into jj."""
-        await self._runner.run(["git", "import"])
+        await self._runner.run(["git", "import"], capture_stdout=False)
 
     # -- Bundle operations (via underlying git repo) ------------------------
 
     async def _workspace_root(self) -> str:
-        result = await self._runner.run(["workspace", "root"])
-        return result.stdout.strip()
+        if self._root is not None:
+            return self._root
+        result = await self._runner.run(["workspace", "root"], read_only=True)
+        root = result.stdout.strip()
+        # Without an explicit repo path jj resolves the workspace from the
+        # process cwd, which may change between calls, so only cache a root
+        # that is pinned by -R
+        if self._runner.repo_path is not None:
+            self._root = root
+        return root
 
     async def _git_cmd(self, args: list[str]) -> subprocess.CompletedProcess[str]:
         """Run a raw git command against the underlying git repo."""
@@ -0,0 +1,16 @@
+"""JSON decoding, using orjson when it is installed."""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    import json
+
+    def loads(data: str | bytes) -> Any:
+        return json.loads(data)
+
+else:
+    loads = orjson.loads
@@ -4,6 +4,51 @@ from ._runner import Runner
 from .models import Operation
 
 
+def _parse_block(lines: list[str]) -> Operation:
+    """Build an Operation from the non-blank lines of one log entry."""
+    # "<id> <user> <time-description>"; the root operation has only "<id> root()"
+    op_id, user, time = (*lines[0].split(None, 2), "", "")[:3]
+    desc_lines: list[str] = []
+    tags = ""
+    for line in lines[1:]:
+        if line.startswith("args: "):
+            tags = line[6:]  # store the args in tags for reference
+        else:
+            desc_lines.append(line)
+    return Operation(
+        id=op_id,
+        description="\n".join(desc_lines),
+        time=time,
+        user=user,
+        tags=tags,
+    )
+
+
+class _OpLogParser:
+    """Incrementally parse ``jj operation log --no-graph`` output line by line.
+
+    Each operation is emitted as soon as the blank line ending its block is
+    fed, so the log can be parsed while jj is still writing it.
+    """
+
+    def __init__(self) -> None:
+        self.operations: list[Operation] = []
+        self._lines: list[str] = []
+
+    def feed_line(self, line: str) -> None:
+        if line and not line.isspace():
+            self._lines.append(line)
+        elif self._lines:
+            self.operations.append(_parse_block(self._lines))
+            self._lines = []
+
+    def close(self) -> list[Operation]:
+        if self._lines:
+            self.operations.append(_parse_block(self._lines))
+            self._lines = []
+        return self.operations
+
+
 class OperationManager:
     """Manages jj operations (repo.op.*)."""
 
@@ -12,19 +57,29 @@ class OperationManager:
 
     async def log(self, *, limit: int | None = None) -> list[Operation]:
         """List operations."""
-        args = ["operation", "log", "--no-graph"]
-        if limit is not None:
-            args.extend(["-n", str(limit)])
-        result = await self._runner.run(args)
-        return self._parse_op_log(result.stdout)
+        args = [
+            "operation",
+            "log",
+            "--no-graph",
+            *(("-n", str(limit)) if limit is not None else ()),
+        ]
+        parser = _OpLogParser()
+        await self._runner.run_stream(
+            args, read_only=True, on_stdout_line=parser.feed_line
+        )
+        return parser.close()
 
     async def restore(self, operation_id: str) -> None:
         """Restore to a previous operation."""
-        await self._runner.run(["operation", "restore", operation_id])
+        await self._runner.run(
+            ["operation", "restore", operation_id], capture_stdout=False
+        )
 
     async def revert(self, operation_id: str) -> None:
         """Revert an operation (inverse patch)."""
-        await self._runner.run(["operation", "undo", operation_id])
+        await self._runner.run(
+            ["operation", "undo", operation_id], capture_stdout=False
+        )
 
     @staticmethod
     def _parse_op_log(output: str) -> list[Operation]:
@@ -40,47 +95,7 @@ class OperationManager:
 
             000000000000 root()
         """
-        operations: list[Operation] = []
-        # Split into blocks separated by blank lines
-        blocks: list[list[str]] = []
-        current_block: list[str] = []
+        parser = _OpLogParser()
         for line in output.splitlines():
-            if not line.strip():
-                if current_block:
-                    blocks.append(current_block)
-                    current_block = []
-            else:
-                current_block.append(line)
-        if current_block:
-            blocks.append(current_block)
-
-        for block in blocks:
-            if not block:
-                continue
-            # First line: "<id> <user> <time>" (3+ space-separated tokens)
-            header = block[0]
-            parts = header.split(None, 2)
-            op_id = parts[0] if len(parts) >= 1 else ""
-            user = parts[1] if len(parts) >= 2 else ""
-            time = parts[2] if len(parts) >= 3 else ""
-            # Remaining lines: description, then optionally "args: ..."
-            desc_lines: list[str] = []
-            tags = ""
-            for line in block[1:]:
-                if line.startswith("args: "):
-                    tags = line[6:]  # store the args in tags for reference
-                else:
-                    desc_lines.append(line)
-            description = "\n".join(desc_lines)
-
-            operations.append(
-                Operation(
-                    id=op_id,
-                    description=description,
-                    time=time,
-                    user=user,
-                    tags=tags,
-                )
-            )
-
-        return operations
+            parser.feed_line(line)
+        return parser.close()
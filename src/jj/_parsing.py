@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-import json
-
-from .models import Change
+from ._json import loads
+from .models import Bookmark, Change
 
 # Template that produces valid JSON per change by wrapping json(self) as "base"
 # and appending extra fields not included in json(self).
@@ -20,30 +19,64 @@ CHANGE_TEMPLATE = (
     ")"
 )
 
-# Separator used between multiple log entries
-SEPARATOR = "<<JJ_SEP>>"
+# Template for multi-change output: one JSON object per line (NDJSON)
+CHANGE_LIST_TEMPLATE = CHANGE_TEMPLATE + ' ++ "\\n"'
+
+# One JSON object per bookmark (local or remote) for `jj bookmark list -T`
+BOOKMARK_TEMPLATE = (
+    'surround("{", "}", '
+    '"\\"name\\":" ++ json(name)'
+    ' ++ ",\\"remote\\":" ++ json(remote)'
+    ' ++ ",\\"present\\":" ++ json(present)'
+    ') ++ "\\n"'
+)
+
+# One JSON string (the workspace name) per line for `jj workspace list -T`
+WORKSPACE_TEMPLATE = 'json(name) ++ "\\n"'
+
+
+class ChangeStreamParser:
+    """Incrementally parse CHANGE_LIST_TEMPLATE output as it arrives.
 
-# Template with separator for multi-change output
-CHANGE_LIST_TEMPLATE = CHANGE_TEMPLATE + f' ++ "{SEPARATOR}"'
+    Each line is a complete record, so changes are parsed one line at a time
+    and only the current line is ever buffered.
+    """
+
+    def __init__(self) -> None:
+        self.changes: list[Change] = []
+
+    def feed_line(self, line: str) -> None:
+        if line and not line.isspace():
+            self.changes.append(Change.from_json_bytes(line))
+
+    def close(self) -> list[Change]:
+        return self.changes
 
 
 def parse_changes(output: str) -> list[Change]:
     """Parse multiple Change objects from jj log output."""
-    output = output.strip()
-    if not output:
-        return []
-    parts = output.split(SEPARATOR)
-    changes: list[Change] = []
-    for part in parts:
-        part = part.strip()
-        if not part:
-            continue
-        data = json.loads(part)
-        changes.append(Change.from_json(data))
-    return changes
+    return [
+        Change.from_json_bytes(line)
+        for line in output.splitlines()
+        if line and not line.isspace()
+    ]
 
 
 def parse_change(output: str) -> Change:
     """Parse a single Change object from jj output."""
-    data = json.loads(output.strip())
-    return Change.from_json(data)
+    # JSON allows surrounding whitespace, so no need to strip first
+    return Change.from_json_bytes(output)
+
+
+def parse_bookmarks(output: str) -> list[Bookmark]:
+    """Parse BOOKMARK_TEMPLATE output."""
+    return [
+        Bookmark.from_json(loads(line))
+        for line in output.splitlines()
+        if line and not line.isspace()
+    ]
+
+
+def parse_workspace_names(output: str) -> list[str]:
+    """Parse WORKSPACE_TEMPLATE output."""
+    return [loads(line) for line in output.splitlines() if line and not line.isspace()]
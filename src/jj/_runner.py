@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import shutil
 import subprocess
+from functools import cache
 from pathlib import Path
 
-from ._executor import Executor, LocalExecutor
+from ._executor import Executor, LineCallback, LocalExecutor
 from .errors import JJCommandError, JJNotFoundError, JJRepoNotFoundError
 
 _REPO_NOT_FOUND_HINTS = (
@@ -13,39 +15,199 @@ _REPO_NOT_FOUND_HINTS = (
     "is not a valid jj repo",
 )
 
+# Upper bound on jj processes run_many() keeps in flight at once
+_MAX_CONCURRENCY = 8
+
+# LocalExecutor holds no state, so every Runner can share one
+_DEFAULT_EXECUTOR = LocalExecutor()
+
+
+@cache
+def _resolve_jj(jj_path: str) -> str | None:
+    """Resolve *jj_path* on PATH, memoized per process."""
+    return shutil.which(jj_path)
+
+
+def clear_jj_cache() -> None:
+    """Forget previously resolved jj binaries (e.g. after PATH changes)."""
+    _resolve_jj.cache_clear()
+
 
 class Runner:
-    """Low-level async wrapper for jj commands."""
+    """Low-level async wrapper for jj commands.
+
+    A Runner keeps no per-command state, so concurrent ``run`` calls are safe
+    whenever the executor's ``execute`` is.
+    """
 
     def __init__(
         self,
         jj_path: str = "jj",
-        repo_path: Path | None = None,
+        repo_path: str | Path | None = None,
         executor: Executor | None = None,
     ) -> None:
         self.jj_path = jj_path
         self.repo_path = repo_path
-        self.executor = executor or LocalExecutor()
-        if not shutil.which(jj_path):
+        self.executor = executor or _DEFAULT_EXECUTOR
+        # Bumped whenever a command not marked read-only is started
+        self.mutations = 0
+        # Only a local executor runs jj on this host; others (Docker, mocks)
+        # resolve the binary wherever they actually execute it
+        if isinstance(self.executor, LocalExecutor) and not _resolve_jj(jj_path):
             raise JJNotFoundError(jj_path)
+        # Every command starts the same way, so build the prefix once
+        self._prefix: tuple[str, ...] = (jj_path, "--no-pager", "--color", "never")
+        if repo_path is not None:
+            self._prefix += ("--repository", str(repo_path))
+
+    def _build(self, args: list[str]) -> list[str]:
+        return [*self._prefix, *args]
+
+    @staticmethod
+    def _check(cmd: list[str], result: subprocess.CompletedProcess[str]) -> None:
+        if result.returncode != 0:
+            stderr = result.stderr.strip()
+            if any(hint in stderr for hint in _REPO_NOT_FOUND_HINTS):
+                raise JJRepoNotFoundError(cmd, result.returncode, stderr)
+            raise JJCommandError(cmd, result.returncode, stderr)
 
     async def run(
         self,
         args: list[str],
         *,
         check: bool = True,
+        capture_stdout: bool = True,
+        read_only: bool = False,
     ) -> subprocess.CompletedProcess[str]:
-        cmd = [self.jj_path, "--no-pager", "--color", "never"]
-        if self.repo_path is not None:
-            cmd.extend(["--repository", str(self.repo_path)])
-        cmd.extend(args)
+        """Run ``jj <args>``.
 
-        result = await self.executor.execute(cmd)
+        Pass ``capture_stdout=False`` when the output will be ignored; executors
+        that support it then skip decoding stdout and ``result.stdout`` is empty.
+        Pass ``read_only=True`` for queries; any other command may change the
+        repo and bumps ``mutations``.
+        """
+        cmd = self._build(args)
+        if not read_only:
+            self.mutations += 1
+        execute_quiet = getattr(self.executor, "execute_quiet", None)
+        if capture_stdout or execute_quiet is None:
+            result = await self.executor.execute(cmd)
+        else:
+            result = await execute_quiet(cmd)
+        if check:
+            self._check(cmd, result)
+        return result
 
-        if check and result.returncode != 0:
-            stderr = result.stderr.strip()
-            if any(hint in stderr for hint in _REPO_NOT_FOUND_HINTS):
-                raise JJRepoNotFoundError(cmd, result.returncode, stderr)
-            raise JJCommandError(cmd, result.returncode, stderr)
+    async def warmup(self) -> None:
+        """Run ``jj --version`` so the first real command finds warm caches.
 
+        Useful right after starting a container: it faults in the jj binary and,
+        for the persistent DockerExecutor, opens the shell ahead of time.
+        Failures are ignored; the next real command will report them.
+        """
+        await self.run(["--version"], check=False, capture_stdout=False, read_only=True)
+
+    async def run_stream(
+        self,
+        args: list[str],
+        *,
+        check: bool = True,
+        read_only: bool = False,
+        on_stdout_line: LineCallback | None = None,
+        on_stderr_line: LineCallback | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        """Like :meth:`run`, but report output lines as they are produced.
+
+        Callbacks receive each line without its trailing newline. Executors
+        without a ``stream`` method are run normally and their captured output
+        replayed through the callbacks afterwards.
+        """
+        cmd = self._build(args)
+        if not read_only:
+            self.mutations += 1
+        stream = getattr(self.executor, "stream", None)
+        if stream is not None:
+            result = await stream(
+                cmd, on_stdout_line=on_stdout_line, on_stderr_line=on_stderr_line
+            )
+        else:
+            result = await self.executor.execute(cmd)
+            for text, on_line in (
+                (result.stdout, on_stdout_line),
+                (result.stderr, on_stderr_line),
+            ):
+                if on_line is not None:
+                    for line in text.splitlines():
+                        if (pending := on_line(line)) is not None:
+                            await pending
+        if check:
+            self._check(cmd, result)
         return result
+
+    async def run_many(
+        self,
+        cmds: list[list[str]],
+        *,
+        check: bool = True,
+        read_only: bool = False,
+        max_concurrency: int = _MAX_CONCURRENCY,
+    ) -> list[subprocess.CompletedProcess[str]]:
+        """Run independent jj commands, returning results in the order given.
+
+        Only batch commands that don't depend on each other's effects (e.g.
+        read-only queries, passing ``read_only=True``). If the executor
+        provides ``execute_many`` the whole batch is handed over in one
+        round-trip; otherwise the commands run concurrently, at most
+        *max_concurrency* at a time.
+        """
+        full_cmds = [self._build(args) for args in cmds]
+        if not read_only:
+            self.mutations += 1
+        execute_many = getattr(self.executor, "execute_many", None)
+        if execute_many is not None:
+            results = list(await execute_many(full_cmds))
+        else:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def execute(cmd: list[str]) -> subprocess.CompletedProcess[str]:
+                async with semaphore:
+                    return await self.executor.execute(cmd)
+
+            results = list(await asyncio.gather(*(execute(c) for c in full_cmds)))
+
+        if check:
+            for cmd, result in zip(full_cmds, results, strict=True):
+                self._check(cmd, result)
+        return results
+
+    async def run_sequence(
+        self,
+        cmds: list[list[str]],
+        *,
+        check: bool = True,
+    ) -> list[subprocess.CompletedProcess[str]]:
+        """Run jj commands one after another, in one round-trip if possible.
+
+        Use this when later commands depend on earlier ones, such as a mutation
+        followed by a query of its result. Executors providing ``execute_many``
+        receive the whole batch at once and run every command even if an
+        earlier one fails; the first failure is still raised when *check* is
+        set. Otherwise the commands run one at a time, stopping at a failure.
+        """
+        full_cmds = [self._build(args) for args in cmds]
+        self.mutations += 1
+        execute_many = getattr(self.executor, "execute_many", None)
+        if execute_many is not None:
+            results = list(await execute_many(full_cmds))
+            if check:
+                for cmd, result in zip(full_cmds, results, strict=True):
+                    self._check(cmd, result)
+            return results
+
+        results = []
+        for cmd in full_cmds:
+            result = await self.executor.execute(cmd)
+            if check:
+                self._check(cmd, result)
+            results.append(result)
+        return results
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ._parsing import WORKSPACE_TEMPLATE, parse_workspace_names
 from ._runner import Runner
 
 
@@ -11,35 +12,30 @@ class WorkspaceManager:
 
     async def add(self, path: str, *, name: str | None = None) -> None:
         """Add a new workspace."""
-        args = ["workspace", "add", path]
-        if name is not None:
-            args.extend(["--name", name])
-        await self._runner.run(args)
+        args = [
+            "workspace",
+            "add",
+            path,
+            *(("--name", name) if name is not None else ()),
+        ]
+        await self._runner.run(args, capture_stdout=False)
 
     async def forget(self, *names: str) -> None:
         """Forget workspaces."""
-        args = ["workspace", "forget"]
-        args.extend(names)
-        await self._runner.run(args)
+        await self._runner.run(["workspace", "forget", *names], capture_stdout=False)
 
     async def list(self) -> list[str]:
         """List workspaces. Returns workspace names."""
-        result = await self._runner.run(["workspace", "list"])
-        names: list[str] = []
-        for line in result.stdout.strip().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            # Format: "name: change_id (description)"
-            name = line.split(":")[0].strip()
-            names.append(name)
-        return names
+        result = await self._runner.run(
+            ["workspace", "list", "-T", WORKSPACE_TEMPLATE], read_only=True
+        )
+        return parse_workspace_names(result.stdout)
 
     async def root(self) -> str:
         """Return the root path of the current workspace."""
-        result = await self._runner.run(["workspace", "root"])
+        result = await self._runner.run(["workspace", "root"], read_only=True)
         return result.stdout.strip()
 
     async def update_stale(self) -> None:
         """Update a stale workspace."""
-        await self._runner.run(["workspace", "update-stale"])
+        await self._runner.run(["workspace", "update-stale"], capture_stdout=False)
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import re
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 
+from ._json import loads
 
-@dataclass(frozen=True)
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(text: str) -> datetime:
+    # Author and committer times repeat heavily across a log, and datetimes are
+    # immutable, so identical strings can share one parsed object
+    return datetime.fromisoformat(text)
+
+
+@dataclass(frozen=True, slots=True)
 class Signature:
     """Author or committer identity."""
 
@@ -15,21 +27,24 @@ class Signature:
     @classmethod
     def from_json(cls, data: dict) -> Signature:
         return cls(
-            name=data["name"],
-            email=data["email"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            # Identities recur across a log, so keep one copy of each
+            name=sys.intern(data["name"]),
+            email=sys.intern(data["email"]),
+            timestamp=_parse_timestamp(data["timestamp"]),
         )
 
 
 def _extract_names(items: list) -> list[str]:
     """Extract name strings from json(bookmarks)/json(tags) output.
 
-    These are lists of ``{"name": "...", "target": [...]}`` objects.
+    These are lists of ``{"name": "...", "target": [...]}`` objects. Names are
+    interned since the same bookmarks and tags recur across many changes.
     """
-    return [item["name"] if isinstance(item, dict) else item for item in items]
+    intern = sys.intern
+    return [intern(item["name"] if isinstance(item, dict) else item) for item in items]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Change:
     """A jj change (commit) with its metadata."""
 
@@ -46,6 +61,11 @@ class Change:
     conflict: bool = False
     hidden: bool = False
 
+    @classmethod
+    def from_json_bytes(cls, buf: bytes | str) -> Change:
+        """Decode one raw JSON record (as emitted by CHANGE_TEMPLATE)."""
+        return cls.from_json(loads(buf))
+
     @classmethod
     def from_json(cls, data: dict) -> Change:
         base = data.get("base", data)
@@ -65,7 +85,37 @@ class Change:
         )
 
 
-@dataclass(frozen=True)
+# One ``jj diff --summary`` line: "M path" or "R dir/{from => to}/rest".
+# Paths exclude \r so CRLF output parses the same as LF.
+_DIFF_LINE_RE = re.compile(
+    r"^[ \t]*(\S)[ \t]*"
+    r"(?:([^\r\n{]*)\{[ \t]*([^\r\n]*?)[ \t]*=>[ \t]*([^\r\n]*?)[ \t]*\}"
+    r"([^\r\n]*?)|([^\r\n]*?))"
+    r"[ \t]*\r?$",
+    re.MULTILINE,
+)
+
+
+def _rename_side(prefix: str, middle: str, suffix: str) -> str:
+    # An empty side ("{old => }/a.py") would leave a doubled or leading "/"
+    if not middle and suffix[:1] == "/":
+        suffix = suffix[1:]
+    return prefix + middle + suffix
+
+
+def _diff_entry(m: re.Match[str]) -> DiffEntry:
+    # Groups: status, rename prefix, source, target, suffix, plain path
+    status, prefix, old, new, suffix, path = m.groups()
+    if path is not None:
+        return DiffEntry(status=status, path=path)
+    return DiffEntry(
+        status=status,
+        path=_rename_side(prefix, new, suffix),
+        from_path=_rename_side(prefix, old, suffix),
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class DiffEntry:
     """A single file entry in a diff summary."""
 
@@ -74,7 +124,7 @@ class DiffEntry:
     from_path: str | None = None  # set for renames
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiffSummary:
     """Parsed output of jj diff --summary."""
 
@@ -82,30 +132,10 @@ class DiffSummary:
 
     @classmethod
     def parse(cls, text: str) -> DiffSummary:
-        entries: list[DiffEntry] = []
-        for line in text.strip().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            # Format: "M path" or "R {from => to}"
-            status = line[0]
-            rest = line[1:].strip()
-            if status == "R" and " => " in rest:
-                rest = rest.strip("{}")
-                from_path, _, to_path = rest.partition(" => ")
-                entries.append(
-                    DiffEntry(
-                        status=status,
-                        path=to_path.strip(),
-                        from_path=from_path.strip(),
-                    )
-                )
-            else:
-                entries.append(DiffEntry(status=status, path=rest))
-        return cls(entries=entries)
-
-
-@dataclass(frozen=True)
+        return cls(entries=[_diff_entry(m) for m in _DIFF_LINE_RE.finditer(text)])
+
+
+@dataclass(frozen=True, slots=True)
 class Bookmark:
     """A jj bookmark."""
 
@@ -113,8 +143,17 @@ class Bookmark:
     present: bool = True
     tracking: str | None = None  # e.g. "origin" if tracking a remote
 
+    @classmethod
+    def from_json(cls, data: dict) -> Bookmark:
+        return cls(
+            name=data["name"],
+            present=data.get("present", True),
+            # Local bookmarks report no remote as null (or "" on older jj)
+            tracking=data.get("remote") or None,
+        )
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Operation:
     """A jj operation log entry."""
 
@@ -1,16 +1,62 @@
 from __future__ import annotations
 
+import asyncio
+import re
 import subprocess
+import time
+from collections.abc import AsyncIterator
+from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
 
 from ._executor import Executor
-from ._parsing import CHANGE_LIST_TEMPLATE, CHANGE_TEMPLATE, parse_change, parse_changes
+from ._parsing import (
+    CHANGE_LIST_TEMPLATE,
+    CHANGE_TEMPLATE,
+    ChangeStreamParser,
+    parse_change,
+)
 from ._runner import Runner
 from .models import Change, DiffSummary
 
+# Fixed leading arguments of the hot query commands
+_LOG_PREFIX = ("log", "--no-graph", "-T", CHANGE_LIST_TEMPLATE)
+_SHOW_PREFIX = ("log", "--no-graph", "-T", CHANGE_TEMPLATE)
 
-@dataclass(frozen=True)
+
+# Parsed changes ilog() lets jj get ahead of the consumer by before pausing it
+_ILOG_BUFFER = 64
+
+# `jj duplicate` reports "Duplicated <commit> as <change> <commit> ..." per revision
+_DUPLICATED_RE = re.compile(r"^Duplicated \S+ as (\S+)", re.MULTILINE)
+
+
+def _log_args(revset: str, limit: int | None) -> list[str]:
+    return [
+        *_LOG_PREFIX,
+        "-r",
+        revset,
+        *(("-n", str(limit)) if limit is not None else ()),
+    ]
+
+
+def _show_args(rev: str) -> list[str]:
+    return [*_SHOW_PREFIX, "-r", rev, "-n", "1"]
+
+
+def _diff_args(
+    fmt: str, revision: str | None, from_rev: str | None, to_rev: str | None
+) -> list[str]:
+    return [
+        "diff",
+        fmt,
+        *(("-r", revision) if revision is not None else ()),
+        *(("--from", from_rev) if from_rev is not None else ()),
+        *(("--to", to_rev) if to_rev is not None else ()),
+    ]
+
+
+@dataclass(frozen=True, slots=True)
 class Status:
     """Working copy status: current change + diff summary."""
 
@@ -19,7 +65,14 @@ class Status:
 
 
 class Repo:
-    """Main entry point for interacting with a jj repository."""
+    """Main entry point for interacting with a jj repository.
+
+    Pass *working_copy_ttl* (seconds) to reuse the result of ``show("@")`` for
+    that long. Any command run through this Repo other than its read-only
+    queries (including ``git push``/``fetch`` and :meth:`run`) drops the
+    cached change, but edits to files on disk or by other processes are not
+    noticed until the TTL runs out.
+    """
 
     def __init__(
         self,
@@ -27,9 +80,12 @@ class Repo:
         *,
         jj_path: str = "jj",
         executor: Executor | None = None,
+        working_copy_ttl: float | None = None,
     ) -> None:
-        repo_path = Path(path) if path is not None else None
-        self._runner = Runner(jj_path=jj_path, repo_path=repo_path, executor=executor)
+        self._runner = Runner(jj_path=jj_path, repo_path=path, executor=executor)
+        self._wc_ttl = working_copy_ttl
+        # (expiry, Runner.mutations when fetched, change)
+        self._wc_cache: tuple[float, int, Change] | None = None
 
         # Lazy imports to avoid circular dependencies
         from ._bookmark import BookmarkManager
@@ -53,6 +109,10 @@ class Repo:
         """Run an arbitrary jj command and return the raw CompletedProcess."""
         return await self._runner.run(args, check=check)
 
+    async def warmup(self) -> None:
+        """Run a no-op jj command to prime caches before latency-sensitive work."""
+        await self._runner.warmup()
+
     # -- Query commands -----------------------------------------------------
 
     async def log(
@@ -62,17 +122,77 @@ class Repo:
         limit: int | None = None,
     ) -> list[Change]:
         """Return changes matching a revset."""
-        args = ["log", "--no-graph", "-T", CHANGE_LIST_TEMPLATE, "-r", revset]
-        if limit is not None:
-            args.extend(["-n", str(limit)])
-        result = await self._runner.run(args)
-        return parse_changes(result.stdout)
+        parser = ChangeStreamParser()
+        await self._runner.run_stream(
+            _log_args(revset, limit), read_only=True, on_stdout_line=parser.feed_line
+        )
+        return parser.close()
+
+    async def ilog(
+        self,
+        *,
+        revset: str = "@",
+        limit: int | None = None,
+    ) -> AsyncIterator[Change]:
+        """Yield changes matching a revset as jj produces them.
+
+        Unlike :meth:`log`, the changes are never all held at once: jj is
+        paused while a small buffer of parsed changes waits for the consumer,
+        so large revsets use bounded memory. Leaving the loop early stops jj.
+        """
+        queue: asyncio.Queue[Change | Exception | None] = asyncio.Queue(
+            maxsize=_ILOG_BUFFER
+        )
+
+        async def on_line(line: str) -> None:
+            if line and not line.isspace():
+                await queue.put(Change.from_json_bytes(line))
+
+        async def produce() -> None:
+            try:
+                await self._runner.run_stream(
+                    _log_args(revset, limit), read_only=True, on_stdout_line=on_line
+                )
+            except Exception as exc:  # Command and parse errors
+                await queue.put(exc)
+            else:
+                await queue.put(None)
+
+        task = asyncio.ensure_future(produce())
+        try:
+            while (item := await queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
 
     async def show(self, rev: str = "@") -> Change:
         """Show a single change."""
-        args = ["log", "--no-graph", "-T", CHANGE_TEMPLATE, "-r", rev, "-n", "1"]
-        result = await self._runner.run(args)
-        return parse_change(result.stdout)
+        if rev == "@" and (cached := self._cached_working_copy()) is not None:
+            return cached
+        mutations = self._runner.mutations
+        result = await self._runner.run(_show_args(rev), read_only=True)
+        change = parse_change(result.stdout)
+        if rev == "@":
+            self._cache_working_copy(change, mutations)
+        return change
+
+    def _cached_working_copy(self) -> Change | None:
+        if self._wc_cache is None:
+            return None
+        expiry, mutations, change = self._wc_cache
+        if mutations != self._runner.mutations or time.monotonic() >= expiry:
+            self._wc_cache = None
+            return None
+        return change
+
+    def _cache_working_copy(self, change: Change, mutations: int) -> None:
+        if self._wc_ttl is not None:
+            self._wc_cache = (time.monotonic() + self._wc_ttl, mutations, change)
 
     async def diff(
         self,
@@ -82,14 +202,8 @@ class Repo:
         to_rev: str | None = None,
     ) -> DiffSummary:
         """Return a parsed diff summary."""
-        args = ["diff", "--summary"]
-        if revision is not None:
-            args.extend(["-r", revision])
-        if from_rev is not None:
-            args.extend(["--from", from_rev])
-        if to_rev is not None:
-            args.extend(["--to", to_rev])
-        result = await self._runner.run(args)
+        args = _diff_args("--summary", revision, from_rev, to_rev)
+        result = await self._runner.run(args, read_only=True)
         return DiffSummary.parse(result.stdout)
 
     async def diff_git(
@@ -100,32 +214,38 @@ class Repo:
         to_rev: str | None = None,
     ) -> str:
         """Return a raw git-format diff string."""
-        args = ["diff", "--git"]
-        if revision is not None:
-            args.extend(["-r", revision])
-        if from_rev is not None:
-            args.extend(["--from", from_rev])
-        if to_rev is not None:
-            args.extend(["--to", to_rev])
-        result = await self._runner.run(args)
+        args = _diff_args("--git", revision, from_rev, to_rev)
+        result = await self._runner.run(args, read_only=True)
         return result.stdout
 
     async def status(self) -> Status:
         """Return the working copy status (change metadata + diff)."""
-        wc = await self.show("@")
-        ds = await self.diff()
+        # Independent read-only queries, so run the two jj processes together
+        wc, ds = await asyncio.gather(self.show("@"), self.diff())
         return Status(working_copy=wc, diff=ds)
 
     async def file_list(self, *, revision: str | None = None) -> list[str]:
         """List tracked files."""
-        args = ["file", "list"]
-        if revision is not None:
-            args.extend(["-r", revision])
-        result = await self._runner.run(args)
-        return [f for f in result.stdout.strip().splitlines() if f]
+        args = ["file", "list", *(("-r", revision) if revision is not None else ())]
+        result = await self._runner.run(args, read_only=True)
+        return [f for f in result.stdout.splitlines() if f]
 
     # -- Mutation commands --------------------------------------------------
 
+    async def _mutate_and_show(self, args: list[str], rev: str) -> Change:
+        """Run a mutating command, then show *rev*.
+
+        Both commands go out in one round-trip when the executor supports
+        ``execute_many``; otherwise they run back to back.
+        """
+        # run_sequence counts itself as one mutation before it starts
+        mutations = self._runner.mutations + 1
+        _, shown = await self._runner.run_sequence([args, _show_args(rev)])
+        change = parse_change(shown.stdout)
+        if rev == "@":
+            self._cache_working_copy(change, mutations)
+        return change
+
     async def new(
         self,
         *revisions: str,
@@ -142,8 +262,7 @@ class Repo:
             args.append("--insert-before")
         if insert_after:
             args.append("--insert-after")
-        await self._runner.run(args)
-        return await self.show("@")
+        return await self._mutate_and_show(args, "@")
 
     async def describe(
         self,
@@ -156,18 +275,16 @@ class Repo:
         args = ["describe", revision, "-m", message]
         if reset_author:
             args.append("--reset-author")
-        await self._runner.run(args)
-        return await self.show(revision)
+        return await self._mutate_and_show(args, revision)
 
     async def commit(self, *, message: str) -> Change:
         """Finalize the working copy into a named commit and start a new change."""
         args = ["commit", "-m", message]
-        await self._runner.run(args)
-        return await self.show("@-")
+        return await self._mutate_and_show(args, "@-")
 
     async def edit(self, revision: str) -> None:
         """Set the working copy to the given revision."""
-        await self._runner.run(["edit", revision])
+        await self._runner.run(["edit", revision], capture_stdout=False)
 
     async def squash(
         self,
@@ -184,7 +301,7 @@ class Repo:
             args.extend(["--into", into])
         if message is not None:
             args.extend(["-m", message])
-        await self._runner.run(args)
+        await self._runner.run(args, capture_stdout=False)
 
     async def split(
         self,
@@ -198,7 +315,7 @@ class Repo:
             args.extend(["-r", revision])
         args.append("--")
         args.extend(files)
-        await self._runner.run(args)
+        await self._runner.run(args, capture_stdout=False)
 
     async def rebase(
         self,
@@ -216,13 +333,13 @@ class Repo:
             args.extend(["-s", source])
         if branch is not None:
             args.extend(["-b", branch])
-        await self._runner.run(args)
+        await self._runner.run(args, capture_stdout=False)
 
     async def abandon(self, *revisions: str) -> None:
         """Abandon one or more revisions."""
         args = ["abandon"]
         args.extend(revisions if revisions else ["@"])
-        await self._runner.run(args)
+        await self._runner.run(args, capture_stdout=False)
 
     async def restore(
         self,
@@ -239,15 +356,18 @@ class Repo:
             args.extend(["--from", from_rev])
         if to_rev is not None:
             args.extend(["--to", to_rev])
-        await self._runner.run(args)
+        await self._runner.run(args, capture_stdout=False)
 
     async def duplicate(self, *revisions: str) -> list[Change]:
         """Duplicate one or more revisions."""
-        args = ["duplicate"]
-        args.extend(revisions if revisions else ["@"])
-        await self._runner.run(args)
-        return await self.log(revset="latest(@-..)", limit=len(revisions) or 1)
+        args = ["duplicate", *(revisions or ("@",))]
+        result = await self._runner.run(args, capture_stdout=False)
+        new_ids = _DUPLICATED_RE.findall(result.stderr)
+        if not new_ids:
+            # Output format not recognised; fall back to guessing by recency
+            return await self.log(revset="latest(@-..)", limit=len(revisions) or 1)
+        return await self.log(revset="|".join(new_ids))
 
     async def undo(self) -> None:
         """Undo the last operation."""
-        await self._runner.run(["undo"])
+        await self._runner.run(["undo"], capture_stdout=False)
@@ -2,13 +2,34 @@
 
 from __future__ import annotations
 
-import json
+import shutil
 import subprocess
-from collections import deque
-from unittest.mock import patch
 
 import pytest
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    import json
+
+    _dumps = json.dumps
+else:
+
+    def _dumps(obj: object) -> str:
+        return orjson.dumps(obj).decode()
+
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional, not in the dev group
+    pass
+else:
+
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
 # ---------------------------------------------------------------------------
 # MockExecutor
 # ---------------------------------------------------------------------------
@@ -19,7 +40,9 @@ class MockExecutor:
 
     def __init__(self) -> None:
         self.calls: list[list[str]] = []
-        self._responses: deque[subprocess.CompletedProcess[str]] = deque()
+        # (returncode, stdout, stderr), consumed in order via a cursor
+        self._responses: list[tuple[int, str, str]] = []
+        self._next = 0
 
     def queue(
         self,
@@ -28,28 +51,40 @@ class MockExecutor:
         returncode: int = 0,
     ) -> None:
         """Queue a CompletedProcess to be returned by the next execute() call."""
-        self._responses.append(
-            subprocess.CompletedProcess(
-                args=[],
-                returncode=returncode,
-                stdout=stdout,
-                stderr=stderr,
-            )
-        )
+        self._responses.append((returncode, stdout, stderr))
+
+    def script(self, *stdouts: str) -> None:
+        """Queue one successful result per *stdouts* entry, in order."""
+        self._responses.extend((0, out, "") for out in stdouts)
+
+    @property
+    def last_flags(self) -> dict[str, str]:
+        """Map each ``-flag`` in the most recent command to the argument after it."""
+        cmd = self.calls[-1]
+        return {arg: cmd[i + 1] for i, arg in enumerate(cmd[:-1]) if arg[:1] == "-"}
 
     async def execute(self, cmd: list[str]) -> subprocess.CompletedProcess[str]:
         self.calls.append(cmd)
-        if self._responses:
-            resp = self._responses.popleft()
-            # Fill in the actual args
-            return subprocess.CompletedProcess(
-                args=cmd,
-                returncode=resp.returncode,
-                stdout=resp.stdout,
-                stderr=resp.stderr,
-            )
+        if self._next < len(self._responses):
+            returncode, stdout, stderr = self._responses[self._next]
+            self._next += 1
+            return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
         # Default: success with empty output
-        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+
+class BatchExecutor(MockExecutor):
+    """MockExecutor with an ``execute_many`` hook that records each batch."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[list[str]]] = []
+
+    async def execute_many(
+        self, cmds: list[list[str]]
+    ) -> list[subprocess.CompletedProcess[str]]:
+        self.batches.append(cmds)
+        return [await self.execute(cmd) for cmd in cmds]
 
 
 # ---------------------------------------------------------------------------
@@ -57,17 +92,44 @@ class MockExecutor:
 # ---------------------------------------------------------------------------
 
 
+# Resolved at import, before any test patches shutil.which
+_JJ_BIN = shutil.which("jj")
+
+
+@pytest.fixture(scope="session")
+def jj_bin() -> str | None:
+    """Absolute path of the real jj binary, or None if it isn't installed."""
+    return _JJ_BIN
+
+
+@pytest.fixture(scope="session")
+def require_jj(jj_bin: str | None) -> str:
+    """Skip the test unless a real jj binary is available."""
+    if jj_bin is None:
+        pytest.skip("jj binary not found on PATH")
+    return jj_bin
+
+
+@pytest.fixture(autouse=True)
+def _clear_jj_cache():
+    """Runner memoizes PATH lookups; reset so each test's patches take effect."""
+    from jj._runner import clear_jj_cache
+
+    clear_jj_cache()
+    yield
+    clear_jj_cache()
+
+
 @pytest.fixture
 def mock_executor() -> MockExecutor:
     return MockExecutor()
 
 
 def make_runner(executor: MockExecutor, *, repo_path=None, jj_path="jj"):
-    """Create a Runner with shutil.which patched so no real jj is needed."""
+    """Create a Runner; non-local executors skip the jj PATH lookup."""
     from jj._runner import Runner
 
-    with patch("jj._runner.shutil.which", return_value="/usr/bin/jj"):
-        return Runner(jj_path=jj_path, repo_path=repo_path, executor=executor)
+    return Runner(jj_path=jj_path, repo_path=repo_path, executor=executor)
 
 
 @pytest.fixture
@@ -75,12 +137,15 @@ def runner(mock_executor: MockExecutor):
     return make_runner(mock_executor)
 
 
-def make_repo(executor: MockExecutor, *, path=None, jj_path="jj"):
+def make_repo(
+    executor: MockExecutor, *, path=None, jj_path="jj", working_copy_ttl=None
+):
     """Create a Repo backed by a MockExecutor."""
     from jj.repo import Repo
 
-    with patch("jj._runner.shutil.which", return_value="/usr/bin/jj"):
-        return Repo(path, jj_path=jj_path, executor=executor)
+    return Repo(
+        path, jj_path=jj_path, executor=executor, working_copy_ttl=working_copy_ttl
+    )
 
 
 @pytest.fixture
@@ -152,9 +217,9 @@ def make_change_json(
 
 def change_stdout(change_json: dict) -> str:
     """Serialize a change dict to a JSON string (as jj would produce)."""
-    return json.dumps(change_json)
+    return _dumps(change_json)
 
 
-def changes_stdout(*change_jsons: dict, separator: str = "<<JJ_SEP>>") -> str:
-    """Serialize multiple change dicts with the separator."""
-    return separator.join(json.dumps(c) for c in change_jsons) + separator
+def changes_stdout(*change_jsons: dict) -> str:
+    """Serialize multiple change dicts as newline-delimited JSON."""
+    return "".join(_dumps(c) + "\n" for c in change_jsons)
@@ -1,7 +1,11 @@
 """Tests for BookmarkManager."""
 
+import json
+
 import pytest
 
+from jj._parsing import BOOKMARK_TEMPLATE
+
 from .conftest import MockExecutor, make_repo
 
 
@@ -16,11 +20,24 @@ def bm(mx):
     return rp.bookmark, mx
 
 
+def bookmark_line(name: str, remote: str | None = None, present: bool = True) -> str:
+    return json.dumps({"name": name, "remote": remote, "present": present}) + "\n"
+
+
 class TestBookmarkList:
+    @pytest.mark.asyncio
+    async def test_list_requests_template(self, bm):
+        mgr, mx = bm
+        mx.queue(stdout="")
+        await mgr.list()
+        cmd = mx.calls[0]
+        assert "-T" in cmd
+        assert cmd[cmd.index("-T") + 1] == BOOKMARK_TEMPLATE
+
     @pytest.mark.asyncio
     async def test_list_parses_names(self, bm):
         mgr, mx = bm
-        mx.queue(stdout="main: abc123 def456\ndev: 111222 333444\n")
+        mx.queue(stdout=bookmark_line("main") + bookmark_line("dev"))
         result = await mgr.list()
         assert len(result) == 2
         assert result[0].name == "main"
@@ -29,7 +46,7 @@ class TestBookmarkList:
     @pytest.mark.asyncio
     async def test_list_detects_deleted(self, bm):
         mgr, mx = bm
-        mx.queue(stdout="old-branch: abc123 (deleted)\n")
+        mx.queue(stdout=bookmark_line("old-branch", present=False))
         result = await mgr.list()
         assert len(result) == 1
         assert result[0].name == "old-branch"
@@ -38,12 +55,20 @@ class TestBookmarkList:
     @pytest.mark.asyncio
     async def test_list_detects_remote_tracking(self, bm):
         mgr, mx = bm
-        mx.queue(stdout="main@origin: abc123 def456\n")
+        mx.queue(stdout=bookmark_line("main", remote="origin"))
         result = await mgr.list()
         assert len(result) == 1
         assert result[0].name == "main"
         assert result[0].tracking == "origin"
 
+    @pytest.mark.asyncio
+    async def test_list_names_with_colons_and_at_signs(self, bm):
+        mgr, mx = bm
+        mx.queue(stdout=bookmark_line("fix:a@b"))
+        result = await mgr.list()
+        assert result[0].name == "fix:a@b"
+        assert result[0].tracking is None
+
     @pytest.mark.asyncio
     async def test_list_all_remotes_flag(self, bm):
         mgr, mx = bm
@@ -1,21 +1,107 @@
 """Tests for DockerExecutor."""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+from unittest.mock import patch
 
 import pytest
 
+from jj import Repo
 from jj._docker import DockerExecutor
 
+from .conftest import change_stdout, make_change_json
+
 _PATCH_TARGET = "jj._docker.asyncio.create_subprocess_exec"
 
 
+class FakeShell:
+    """Stands in for the ``docker exec -i <container> sh`` process.
+
+    Every command line written to stdin is answered with the next queued
+    response, framed with the executor's sentinel the way the real shell does.
+    """
+
+    def __init__(self, sentinel: str) -> None:
+        self.sentinel = sentinel
+        self.stdin = self
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.returncode: int | None = None
+        self.writes: list[str] = []
+        self._responses: list[tuple[str, str, int]] = []
+
+    def respond(self, stdout: str = "", stderr: str = "", returncode: int = 0) -> None:
+        self._responses.append((stdout, stderr, returncode))
+
+    def write(self, data: bytes) -> None:
+        text = data.decode()
+        self.writes.append(text)
+        for _ in text.splitlines():
+            out, err, rc = self._responses.pop(0)
+            self.stdout.feed_data(f"{out}{self.sentinel}".encode())
+            self.stderr.feed_data(f"{err}{self.sentinel}{rc}{self.sentinel}".encode())
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.stdout.feed_eof()
+        self.stderr.feed_eof()
+        self.returncode = 0
+
+    def die(self, stderr: str, returncode: int) -> None:
+        """Exit the way ``docker exec`` does when the container goes away."""
+        self.stderr.feed_data(stderr.encode())
+        self.stdout.feed_eof()
+        self.stderr.feed_eof()
+        self.returncode = returncode
+
+    async def wait(self) -> int:
+        return self.returncode or 0
+
+    def kill(self) -> None:
+        self.returncode = -9
+
+
+class StubProc:
+    """Minimal stand-in for a finished ``asyncio.subprocess.Process``."""
+
+    def __init__(
+        self, stdout: bytes | None = b"", stderr: bytes = b"", returncode: int = 0
+    ) -> None:
+        self._output = (stdout, stderr)
+        self.returncode = returncode
+
+    async def communicate(self) -> tuple[bytes | None, bytes]:
+        return self._output
+
+
+class StreamProc:
+    """Stand-in for a one-shot ``docker exec`` whose pipes are read as streams."""
+
+    def __init__(
+        self, stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0
+    ) -> None:
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        for reader, data in ((self.stdout, stdout), (self.stderr, stderr)):
+            reader.feed_data(data)
+            reader.feed_eof()
+        self.returncode: int | None = None
+        self._exit = returncode
+
+    async def wait(self) -> int:
+        self.returncode = self._exit
+        return self._exit
+
+    def kill(self) -> None:
+        self.returncode = -9
+
+
 class TestDockerExecute:
     @pytest.mark.asyncio
     async def test_execute_wraps_command(self):
-        executor = DockerExecutor(container="test-container")
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"output", b"")
-        mock_proc.returncode = 0
+        executor = DockerExecutor(container="test-container", persistent=False)
+        mock_proc = StubProc(b"output", b"")
 
         with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
             result = await executor.execute(["jj", "log"])
@@ -33,12 +119,21 @@ class TestDockerExecute:
         assert result.stdout == "output"
         assert result.returncode == 0
 
+    @pytest.mark.asyncio
+    async def test_execute_without_stdout_uses_devnull(self):
+        executor = DockerExecutor(container="c1", persistent=False)
+        mock_proc = StubProc(None, b"")
+
+        with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
+            result = await executor.execute(["jj", "new"], capture_stdout=False)
+
+        assert mock_exec.call_args[1]["stdout"] == asyncio.subprocess.DEVNULL
+        assert result.stdout == ""
+
     @pytest.mark.asyncio
     async def test_execute_with_workdir(self):
-        executor = DockerExecutor(container="c1", workdir="/repo")
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"")
-        mock_proc.returncode = 0
+        executor = DockerExecutor(container="c1", workdir="/repo", persistent=False)
+        mock_proc = StubProc()
 
         with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
             await executor.execute(["jj", "status"])
@@ -50,10 +145,8 @@ class TestDockerExecute:
 
     @pytest.mark.asyncio
     async def test_execute_with_user(self):
-        executor = DockerExecutor(container="c1", user="nobody")
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"")
-        mock_proc.returncode = 0
+        executor = DockerExecutor(container="c1", user="nobody", persistent=False)
+        mock_proc = StubProc()
 
         with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
             await executor.execute(["jj", "log"])
@@ -65,10 +158,8 @@ class TestDockerExecute:
 
     @pytest.mark.asyncio
     async def test_execute_with_env(self):
-        executor = DockerExecutor(container="c1", env={"FOO": "bar"})
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"")
-        mock_proc.returncode = 0
+        executor = DockerExecutor(container="c1", env={"FOO": "bar"}, persistent=False)
+        mock_proc = StubProc()
 
         with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
             await executor.execute(["jj", "log"])
@@ -79,12 +170,196 @@ class TestDockerExecute:
         assert call_args[idx + 1] == "FOO=bar"
 
 
+class TestDockerPersistentShell:
+    @pytest.mark.asyncio
+    async def test_spawns_one_shell_for_many_commands(self):
+        executor = DockerExecutor(container="c1", workdir="/repo", env={"K": "v"})
+        shell = FakeShell(executor._sentinel)
+        shell.respond("one\n")
+        shell.respond("two\n")
+
+        with patch(_PATCH_TARGET, return_value=shell) as mock_exec:
+            first = await executor.execute(["jj", "log"])
+            second = await executor.execute(["jj", "status"])
+
+        mock_exec.assert_called_once()
+        call_args = mock_exec.call_args[0]
+        assert call_args[:2] == ("docker", "exec")
+        assert call_args[-3] == "-i"
+        assert call_args[call_args.index("-w") + 1] == "/repo"
+        assert call_args[call_args.index("-e") + 1] == "K=v"
+        assert call_args[-2:] == ("c1", "sh")
+
+        assert first.args == ["jj", "log"]
+        assert first.stdout == "one\n"
+        assert second.stdout == "two\n"
+        assert shell.writes[0].startswith("jj log </dev/null;")
+
+    @pytest.mark.asyncio
+    async def test_reports_stderr_and_returncode(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond("partial", "boom\n", 3)
+
+        with patch(_PATCH_TARGET, return_value=shell):
+            result = await executor.execute(["jj", "bad"])
+
+        assert result.stdout == "partial"
+        assert result.stderr == "boom\n"
+        assert result.returncode == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_commands_get_their_own_output(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        for name in ("a", "b", "c"):
+            shell.respond(f"{name}\n")
+
+        with patch(_PATCH_TARGET, return_value=shell) as mock_exec:
+            results = await asyncio.gather(
+                *(executor.execute(["echo", name]) for name in ("a", "b", "c"))
+            )
+
+        mock_exec.assert_called_once()
+        assert [r.args[-1] for r in results] == ["a", "b", "c"]
+        assert [r.stdout for r in results] == ["a\n", "b\n", "c\n"]
+
+    @pytest.mark.asyncio
+    async def test_discarded_stdout_redirected_in_shell(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond()
+
+        with patch(_PATCH_TARGET, return_value=shell):
+            result = await executor.execute(["jj", "new"], capture_stdout=False)
+
+        assert shell.writes[0].startswith("jj new </dev/null >/dev/null;")
+        assert result.stdout == ""
+
+    @pytest.mark.asyncio
+    async def test_quotes_arguments(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond()
+
+        with patch(_PATCH_TARGET, return_value=shell):
+            await executor.execute(["jj", "describe", "-m", "it's done; rm -rf /"])
+
+        assert "'it'\"'\"'s done; rm -rf /'" in shell.writes[0]
+
+    @pytest.mark.asyncio
+    async def test_shell_exit_reports_docker_error_and_respawns(self):
+        executor = DockerExecutor(container="c1")
+        dead = FakeShell(executor._sentinel)
+        dead.write = lambda data: dead.die("container c1 is not running\n", 126)
+        alive = FakeShell(executor._sentinel)
+        alive.respond("ok")
+
+        with patch(_PATCH_TARGET, side_effect=[dead, alive]):
+            failed = await executor.execute(["jj", "log"])
+            result = await executor.execute(["jj", "log"])
+
+        assert failed.returncode == 126
+        assert failed.stderr == "container c1 is not running\n"
+        assert result.stdout == "ok"
+
+    @pytest.mark.asyncio
+    async def test_shell_exit_mid_batch_keeps_finished_results(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond("first")
+        respond = shell.write
+
+        def write(data: bytes) -> None:
+            respond(data.decode().splitlines(keepends=True)[0].encode())
+            shell.die("killed\n", 137)
+
+        shell.write = write
+        with patch(_PATCH_TARGET, return_value=shell):
+            results = await executor.execute_many(
+                [["jj", "a"], ["jj", "b"], ["jj", "c"]]
+            )
+
+        assert results[0].stdout == "first"
+        assert [r.returncode for r in results] == [0, 137, 137]
+        assert [r.stderr for r in results[1:]] == ["killed\n", ""]
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_its_own_exec(self):
+        executor = DockerExecutor(container="c1")
+        proc = StreamProc(b"line1\nline2\npartial", b"warn\n")
+
+        out: list[str] = []
+        err: list[str] = []
+        with patch(_PATCH_TARGET, return_value=proc) as mock_exec:
+            result = await executor.stream(
+                ["jj", "log"], on_stdout_line=out.append, on_stderr_line=err.append
+            )
+
+        assert mock_exec.call_args[0][-3:] == ("c1", "jj", "log")
+        assert out == ["line1", "line2", "partial"]
+        assert err == ["warn"]
+        assert result.stdout == "line1\nline2\npartial"
+
+    @pytest.mark.asyncio
+    async def test_commands_inside_ilog_loop_do_not_deadlock(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond(change_stdout(make_change_json(change_id="wc")))
+        line = change_stdout(make_change_json()) + "\n"
+        # Far more changes than ilog buffers, so the stream is back-pressured
+        log = StreamProc((line * 500).encode())
+
+        def spawn(*args, **kwargs):
+            return shell if args[-1] == "sh" else log
+
+        repo = Repo("/repo", executor=executor)
+        with patch(_PATCH_TARGET, side_effect=spawn):
+
+            async def consume() -> int:
+                seen = 0
+                async for _ in repo.ilog(revset="all()"):
+                    if seen == 0:
+                        assert (await repo.show("@")).change_id == "wc"
+                    seen += 1
+                return seen
+
+            assert await asyncio.wait_for(consume(), timeout=5) == 500
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_shell_immediately(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.write = lambda data: None  # Command never finishes
+
+        with patch(_PATCH_TARGET, return_value=shell):
+            task = asyncio.ensure_future(executor.execute(["jj", "log"]))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert shell.returncode == -9
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_shell(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond()
+
+        with patch(_PATCH_TARGET, return_value=shell) as mock_exec:
+            await executor.execute(["jj", "log"])
+            await executor.stop()
+
+        assert shell.returncode == 0
+        # Not our container, so no "docker stop"
+        assert mock_exec.call_count == 1
+
+
 class TestDockerStart:
     @pytest.mark.asyncio
     async def test_start_builds_correct_command(self):
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"container123\n", b"")
-        mock_proc.returncode = 0
+        mock_proc = StubProc(b"container123\n", b"")
 
         with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
             executor = await DockerExecutor.start(
@@ -112,9 +387,7 @@ class TestDockerStart:
 
     @pytest.mark.asyncio
     async def test_start_error(self):
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"error starting")
-        mock_proc.returncode = 1
+        mock_proc = StubProc(b"", b"error starting", 1)
 
         with (
             patch(_PATCH_TARGET, return_value=mock_proc),
@@ -127,9 +400,7 @@ class TestDockerStop:
     @pytest.mark.asyncio
     async def test_stop_when_owns_container(self):
         executor = DockerExecutor(container="c1", _owns_container=True)
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"")
-        mock_proc.returncode = 0
+        mock_proc = StubProc()
 
         with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
             await executor.stop()
@@ -140,6 +411,17 @@ class TestDockerStop:
         assert "c1" in call_args
         assert executor._owns_container is False
 
+    @pytest.mark.asyncio
+    async def test_stop_skips_grace_period(self):
+        executor = DockerExecutor(container="c1", _owns_container=True)
+        mock_proc = StubProc()
+
+        with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
+            await executor.stop()
+
+        call_args = list(mock_exec.call_args[0])
+        assert call_args[call_args.index("--time") + 1] == "0"
+
     @pytest.mark.asyncio
     async def test_stop_noop_when_not_owned(self):
         executor = DockerExecutor(container="c1", _owns_container=False)
@@ -158,12 +440,59 @@ class TestDockerContextManager:
     @pytest.mark.asyncio
     async def test_aexit_calls_stop(self):
         executor = DockerExecutor(container="c1", _owns_container=True)
-        mock_proc = AsyncMock()
-        mock_proc.communicate.return_value = (b"", b"")
-        mock_proc.returncode = 0
+        mock_proc = StubProc()
 
         with patch(_PATCH_TARGET, return_value=mock_proc):
             async with executor:
                 pass
         # After exiting, should have been stopped
         assert executor._owns_container is False
+
+
+class TestDockerExecuteMany:
+    @pytest.mark.asyncio
+    async def test_execute_many_single_exec_and_split(self):
+        with patch("jj._docker.uuid.uuid4") as mock_uuid:
+            mock_uuid.return_value.hex = "abc"
+            executor = DockerExecutor(container="c1", persistent=False)
+        sep = "<<JJ_EXEC_abc>>"
+        mock_proc = StubProc(
+            f"out1{sep}out2{sep}".encode(), f"{sep}0{sep}err2{sep}3{sep}".encode()
+        )
+
+        with patch(_PATCH_TARGET, return_value=mock_proc) as mock_exec:
+            results = await executor.execute_many([["jj", "log"], ["jj", "st"]])
+
+        assert mock_exec.call_count == 1
+        call_args = mock_exec.call_args[0]
+        assert call_args[:2] == ("docker", "exec")
+        assert call_args[3:5] == ("sh", "-c")
+        assert "jj log" in call_args[5]
+        assert "jj st" in call_args[5]
+
+        assert [r.args for r in results] == [["jj", "log"], ["jj", "st"]]
+        assert [r.stdout for r in results] == ["out1", "out2"]
+        assert [r.stderr for r in results] == ["", "err2"]
+        assert [r.returncode for r in results] == [0, 3]
+
+    @pytest.mark.asyncio
+    async def test_execute_many_empty(self):
+        executor = DockerExecutor(container="c1")
+        with patch(_PATCH_TARGET) as mock_exec:
+            assert await executor.execute_many([]) == []
+        mock_exec.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_many_persistent_single_write(self):
+        executor = DockerExecutor(container="c1")
+        shell = FakeShell(executor._sentinel)
+        shell.respond("a\n")
+        shell.respond("", "bad\n", 2)
+
+        with patch(_PATCH_TARGET, return_value=shell):
+            results = await executor.execute_many([["jj", "log"], ["jj", "st"]])
+
+        assert len(shell.writes) == 1
+        assert [r.stdout for r in results] == ["a\n", ""]
+        assert [r.stderr for r in results] == ["", "bad\n"]
+        assert [r.returncode for r in results] == [0, 2]
@@ -0,0 +1,108 @@
+"""Tests for LocalExecutor and the shared stream-draining helper."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+from jj._executor import LocalExecutor, drain_lines
+
+
+def _feed(*chunks: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    return reader
+
+
+class TestDrainLines:
+    @pytest.mark.asyncio
+    async def test_returns_all_bytes(self):
+        data = await drain_lines(_feed(b"a\nb", b"c\n"))
+        assert data == b"a\nbc\n"
+
+    @pytest.mark.asyncio
+    async def test_reports_lines_across_chunks(self):
+        lines: list[str] = []
+        await drain_lines(_feed(b"fir", b"st\nsec", b"ond\nthird"), lines.append)
+        assert lines == ["first", "second", "third"]
+
+    @pytest.mark.asyncio
+    async def test_long_line_does_not_overrun(self):
+        lines: list[str] = []
+        data = await drain_lines(_feed(b"x" * 200_000 + b"\n"), lines.append)
+        assert len(data) == 200_001
+        assert lines == ["x" * 200_000]
+
+
+class TestLocalExecutorExecute:
+    @pytest.mark.asyncio
+    async def test_capture_stdout_false_skips_stdout_pipe(self):
+        script = "import sys; print('out'); print('err', file=sys.stderr)"
+        result = await LocalExecutor().execute(
+            [sys.executable, "-c", script], capture_stdout=False
+        )
+        assert result.stdout == ""
+        assert result.stderr == "err\n"
+        assert result.returncode == 0
+
+
+class TestLocalExecutorStream:
+    @pytest.mark.asyncio
+    async def test_stream_reports_both_pipes(self):
+        script = (
+            "import sys\n"
+            "print('out1'); print('out2')\n"
+            "print('err1', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        out: list[str] = []
+        err: list[str] = []
+        result = await LocalExecutor().stream(
+            [sys.executable, "-c", script],
+            on_stdout_line=out.append,
+            on_stderr_line=err.append,
+        )
+        assert out == ["out1", "out2"]
+        assert err == ["err1"]
+        assert result.stdout.splitlines() == ["out1", "out2"]
+        assert result.returncode == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_large_output_on_both_pipes(self):
+        # Well past the pipe buffer on both streams at once
+        script = (
+            "import sys\n"
+            "sys.stdout.write('o' * 300000)\n"
+            "sys.stderr.write('e' * 300000)\n"
+        )
+        result = await LocalExecutor().stream([sys.executable, "-c", script])
+        assert len(result.stdout) == 300_000
+        assert len(result.stderr) == 300_000
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_process(self):
+        # Writes forever, so it only stops if the executor kills it
+        script = "import os\nprint(os.getpid(), flush=True)\nwhile True: print('x')\n"
+        pids: list[int] = []
+
+        async def on_line(line: str) -> None:
+            if not pids:
+                pids.append(int(line))
+            await asyncio.sleep(3600)
+
+        task = asyncio.ensure_future(
+            LocalExecutor().stream(
+                [sys.executable, "-c", script], on_stdout_line=on_line
+            )
+        )
+        while not pids:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Killed and reaped, so the pid no longer exists
+        with pytest.raises(ProcessLookupError):
+            os.kill(pids[0], 0)
@@ -1,7 +1,5 @@
 """Tests for GitManager."""
 
-from unittest.mock import patch
-
 import pytest
 
 from jj.errors import JJCommandError
@@ -35,10 +33,7 @@ class TestGitPush:
         mgr, mx = gm
         mx.queue(stdout="", stderr="")
         await mgr.push(remote="upstream")
-        cmd = mx.calls[0]
-        assert "--remote" in cmd
-        idx = cmd.index("--remote")
-        assert cmd[idx + 1] == "upstream"
+        assert mx.last_flags["--remote"] == "upstream"
 
     @pytest.mark.asyncio
     async def test_push_with_bookmark(self, gm):
@@ -59,10 +54,7 @@ class TestGitPush:
         mgr, mx = gm
         mx.queue(stdout="", stderr="")
         await mgr.push(change="abc")
-        cmd = mx.calls[0]
-        assert "-c" in cmd
-        idx = cmd.index("-c")
-        assert cmd[idx + 1] == "abc"
+        assert mx.last_flags["-c"] == "abc"
 
 
 class TestGitFetch:
@@ -95,14 +87,13 @@ class TestGitClone:
     async def test_clone_basic(self):
         mx = MockExecutor()
         mx.queue(stdout="")  # clone command
-        with patch("jj._runner.shutil.which", return_value="/usr/bin/jj"):
-            from jj._git import GitManager
-
-            await GitManager.clone(
-                "https://github.com/user/repo.git",
-                "/tmp/test-clone",
-                executor=mx,
-            )
+        from jj._git import GitManager
+
+        await GitManager.clone(
+            "https://github.com/user/repo.git",
+            "/tmp/test-clone",
+            executor=mx,
+        )
         cmd = mx.calls[0]
         assert "git" in cmd
         assert "clone" in cmd
@@ -113,28 +104,25 @@ class TestGitClone:
     async def test_clone_deduces_path_from_url(self):
         mx = MockExecutor()
         mx.queue(stdout="")
-        with patch("jj._runner.shutil.which", return_value="/usr/bin/jj"):
-            from jj._git import GitManager
+        from jj._git import GitManager
 
-            repo = await GitManager.clone(
-                "https://github.com/user/myrepo.git",
-                executor=mx,
-            )
+        repo = await GitManager.clone(
+            "https://github.com/user/myrepo.git",
+            executor=mx,
+        )
         # Should deduce "myrepo" from URL
-        assert repo._runner.repo_path is not None
-        assert "myrepo" in str(repo._runner.repo_path)
+        assert repo._runner.repo_path == "myrepo"
 
     @pytest.mark.asyncio
     async def test_clone_deduces_path_no_git_suffix(self):
         mx = MockExecutor()
         mx.queue(stdout="")
-        with patch("jj._runner.shutil.which", return_value="/usr/bin/jj"):
-            from jj._git import GitManager
+        from jj._git import GitManager
 
-            repo = await GitManager.clone(
-                "https://github.com/user/myrepo",
-                executor=mx,
-            )
+        repo = await GitManager.clone(
+            "https://github.com/user/myrepo",
+            executor=mx,
+        )
         assert "myrepo" in str(repo._runner.repo_path)
 
 
@@ -189,6 +177,13 @@ class TestGitRemote:
         result = await mgr.remote_list()
         assert result == {}
 
+    @pytest.mark.asyncio
+    async def test_remote_list_name_without_url(self, gm):
+        mgr, mx = gm
+        mx.queue(stdout="origin\n\n")
+        result = await mgr.remote_list()
+        assert result == {"origin": ""}
+
     @pytest.mark.asyncio
     async def test_remote_set_url(self, gm):
         mgr, mx = gm
@@ -223,12 +218,7 @@ class TestGitBundle:
     @pytest.mark.asyncio
     async def test_bundle_create_default_all(self, gm):
         mgr, mx = gm
-        # export
-        mx.queue(stdout="")
-        # workspace root
-        mx.queue(stdout="/repo\n")
-        # git bundle create
-        mx.queue(stdout="", returncode=0)
+        mx.script("", "/repo\n", "")  # export, workspace root, bundle create
         result = await mgr.bundle_create("/tmp/bundle.pack")
         assert result == "/tmp/bundle.pack"
         # First call: jj git export
@@ -242,12 +232,31 @@ class TestGitBundle:
         assert "create" in git_cmd
         assert "--all" in git_cmd
 
+    @pytest.mark.asyncio
+    async def test_workspace_root_looked_up_once(self, mx):
+        mgr = make_repo(mx, path="/repo").git
+        # export, workspace root, git bundle create, git bundle verify
+        mx.script("", "/repo\n", "", "ok\n")
+        await mgr.bundle_create("/tmp/bundle.pack")
+        await mgr.bundle_verify("/tmp/bundle.pack")
+        assert len(mx.calls) == 4
+        assert mx.calls[3][:3] == ["git", "-C", "/repo"]
+
+    @pytest.mark.asyncio
+    async def test_workspace_root_not_cached_without_repo_path(self, gm):
+        mgr, mx = gm
+        # export, workspace root, git bundle create, workspace root, verify
+        mx.script("", "/a\n", "", "/b\n", "ok\n")
+        await mgr.bundle_create("/tmp/bundle.pack")
+        await mgr.bundle_verify("/tmp/bundle.pack")
+        assert len(mx.calls) == 5
+        assert "root" in mx.calls[3]
+        assert mx.calls[4][:3] == ["git", "-C", "/b"]
+
     @pytest.mark.asyncio
     async def test_bundle_create_specific_refs(self, gm):
         mgr, mx = gm
-        mx.queue(stdout="")  # export
-        mx.queue(stdout="/repo\n")  # workspace root
-        mx.queue(stdout="", returncode=0)  # git bundle create
+        mx.script("", "/repo\n", "")  # export, workspace root, bundle create
         await mgr.bundle_create("/tmp/bundle.pack", refs=["main", "dev"])
         git_cmd = mx.calls[2]
         assert "--all" not in git_cmd
@@ -257,8 +266,7 @@ class TestGitBundle:
     @pytest.mark.asyncio
     async def test_bundle_create_error(self, gm):
         mgr, mx = gm
-        mx.queue(stdout="")  # export
-        mx.queue(stdout="/repo\n")  # workspace root
+        mx.script("", "/repo\n")  # export, workspace root
         mx.queue(returncode=1, stderr="bundle error")  # git bundle create fails
         with pytest.raises(JJCommandError):
             await mgr.bundle_create("/tmp/bad.pack")
@@ -266,12 +274,7 @@ class TestGitBundle:
     @pytest.mark.asyncio
     async def test_bundle_unbundle(self, gm):
         mgr, mx = gm
-        # workspace root (for _git_cmd)
-        mx.queue(stdout="/repo\n")
-        # git fetch
-        mx.queue(stdout="", returncode=0)
-        # jj git import
-        mx.queue(stdout="")
+        mx.script("/repo\n", "", "")  # workspace root, git fetch, jj git import
         await mgr.bundle_unbundle("/tmp/bundle.pack")
         # git fetch call
         git_cmd = mx.calls[1]
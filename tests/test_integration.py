@@ -7,28 +7,35 @@ if jj is not found on PATH.
 from __future__ import annotations
 
 import shutil
+import subprocess
 from pathlib import Path
 
 import pytest
 
-from jj._executor import LocalExecutor
 from jj.errors import JJCommandError, JJRepoNotFoundError
 from jj.models import Change, DiffSummary
 from jj.repo import Repo, Status
 
-pytestmark = pytest.mark.skipif(
-    shutil.which("jj") is None,
-    reason="jj binary not found on PATH",
-)
+pytestmark = pytest.mark.usefixtures("require_jj")
 
 
-@pytest.fixture
-async def tmp_repo(tmp_path: Path) -> Repo:
-    """Create a real jj repo in a temp directory and return a Repo."""
+@pytest.fixture(scope="session")
+def template_repo(tmp_path_factory: pytest.TempPathFactory, require_jj: str) -> Path:
+    """An empty jj repo, initialised once and copied for each test."""
+    path = tmp_path_factory.mktemp("jj-template")
     # Init without --repository since the repo doesn't exist yet
-    executor = LocalExecutor()
-    await executor.execute(["jj", "git", "init", str(tmp_path)])
-    return Repo(tmp_path)
+    subprocess.run(
+        [require_jj, "git", "init", str(path)], check=True, capture_output=True
+    )
+    return path
+
+
+@pytest.fixture
+def tmp_repo(tmp_path: Path, jj_bin: str, template_repo: Path) -> Repo:
+    """Copy the template into a temp directory and return a Repo for it."""
+    repo_path = tmp_path / "repo"
+    shutil.copytree(template_repo, repo_path)
+    return Repo(repo_path, jj_path=jj_bin)
 
 
 class TestIntegrationLog:
@@ -254,9 +261,9 @@ class TestIntegrationRun:
 
 class TestIntegrationRepoNotFound:
     @pytest.mark.asyncio
-    async def test_repo_not_found(self, tmp_path: Path):
+    async def test_repo_not_found(self, tmp_path: Path, jj_bin: str):
         non_repo = tmp_path / "not-a-repo"
         non_repo.mkdir()
-        repo = Repo(non_repo)
+        repo = Repo(non_repo, jj_path=jj_bin)
         with pytest.raises((JJRepoNotFoundError, JJCommandError)):
             await repo.log()
@@ -1,5 +1,6 @@
 """Tests for model classes — pure data parsing, no async."""
 
+import json
 from datetime import UTC, datetime
 
 from jj.models import (
@@ -12,7 +13,7 @@ from jj.models import (
     _extract_names,
 )
 
-from .conftest import make_change_json, make_signature_json
+from .conftest import change_stdout, make_change_json, make_signature_json
 
 
 class TestSignature:
@@ -33,6 +34,18 @@ class TestSignature:
         assert sig.timestamp.year == 2025
         assert sig.timestamp.month == 6
 
+    def test_identity_strings_interned(self):
+        first = Signature.from_json(json.loads(json.dumps(make_signature_json())))
+        second = Signature.from_json(json.loads(json.dumps(make_signature_json())))
+        assert first.name is second.name
+        assert first.email is second.email
+
+    def test_identical_timestamps_share_parse(self):
+        data = make_signature_json(timestamp="2025-03-03T09:00:00+01:00")
+        first = Signature.from_json(data)
+        second = Signature.from_json(dict(data))
+        assert first.timestamp is second.timestamp
+
 
 class TestExtractNames:
     def test_object_format(self):
@@ -97,6 +110,16 @@ class TestChange:
         c = Change.from_json(data)
         assert c.parents == ["parent1", "parent2"]
 
+    def test_instances_have_no_dict(self):
+        c = Change.from_json(make_change_json())
+        assert not hasattr(c, "__dict__")
+        assert not hasattr(c.author, "__dict__")
+
+    def test_from_json_bytes(self):
+        raw = change_stdout(make_change_json(change_id="xyz"))
+        assert Change.from_json_bytes(raw.encode()) == Change.from_json_bytes(raw)
+        assert Change.from_json_bytes(raw).change_id == "xyz"
+
 
 class TestDiffSummary:
     def test_modified_added_deleted(self):
@@ -120,6 +143,37 @@ class TestDiffSummary:
         assert DiffSummary.parse("").entries == []
         assert DiffSummary.parse("   \n\n  ").entries == []
 
+    def test_path_with_arrow_is_not_a_rename(self):
+        ds = DiffSummary.parse("M docs/a => b.md\nR {x y.py => z.py}\n")
+        assert ds.entries[0] == DiffEntry(status="M", path="docs/a => b.md")
+        assert ds.entries[1] == DiffEntry(status="R", path="z.py", from_path="x y.py")
+
+    def test_crlf_line_endings(self):
+        ds = DiffSummary.parse("M foo.py\r\nR {a.py => b.py}\r\n")
+        assert ds.entries == [
+            DiffEntry(status="M", path="foo.py"),
+            DiffEntry(status="R", path="b.py", from_path="a.py"),
+        ]
+
+    def test_rename_with_common_prefix_and_suffix(self):
+        text = "R src/{old.py => new.py}\nR {lib => pkg}/mod/__init__.py\n"
+        ds = DiffSummary.parse(text)
+        assert ds.entries == [
+            DiffEntry(status="R", path="src/new.py", from_path="src/old.py"),
+            DiffEntry(
+                status="R",
+                path="pkg/mod/__init__.py",
+                from_path="lib/mod/__init__.py",
+            ),
+        ]
+
+    def test_rename_into_or_out_of_a_directory(self):
+        ds = DiffSummary.parse("R {sub => }/a.py\nR docs/{ => old}/b.md\n")
+        assert ds.entries == [
+            DiffEntry(status="R", path="a.py", from_path="sub/a.py"),
+            DiffEntry(status="R", path="docs/old/b.md", from_path="docs/b.md"),
+        ]
+
     def test_whitespace_handling(self):
         text = "  M  foo.py  \n  A  bar.py  \n"
         ds = DiffSummary.parse(text)
@@ -140,6 +194,14 @@ class TestBookmark:
         assert b.present is True
         assert b.tracking is None
 
+    def test_from_json_remote(self):
+        b = Bookmark.from_json({"name": "main", "remote": "origin", "present": True})
+        assert b == Bookmark(name="main", present=True, tracking="origin")
+
+    def test_from_json_local(self):
+        assert Bookmark.from_json({"name": "dev", "remote": None}).tracking is None
+        assert Bookmark.from_json({"name": "dev", "remote": ""}).tracking is None
+
 
 class TestOperation:
     def test_construction(self):
@@ -2,10 +2,37 @@
 
 import pytest
 
-from jj._operation import OperationManager
+from jj._operation import OperationManager, _OpLogParser
 
 from .conftest import MockExecutor, make_repo
 
+_SINGLE_OP_LOG = "abc123 admin@host now, lasted 5ms\ninit repo\nargs: jj git init\n"
+
+_TWO_OP_LOG = (
+    "op1 u1@host 1 second ago, lasted 10ms\n"
+    "first operation\n"
+    "args: jj new\n"
+    "\n"
+    "op2 u2@host 2 seconds ago, lasted 12ms\n"
+    "second operation\n"
+    "args: jj describe\n"
+)
+
+_REALISTIC_OP_LOG = (
+    "0d76c1c221bd user@host now, lasted 13ms\n"
+    "new empty commit\n"
+    "args: jj new -m second\n"
+    "\n"
+    "4590b0888d6d user@host now, lasted 12ms\n"
+    "describe commit 8990ccc60928\n"
+    "args: jj describe -m 'first change'\n"
+    "\n"
+    "2d0032df3df2 user@host now, lasted 12ms\n"
+    "add workspace 'default'\n"
+    "\n"
+    "000000000000 root()\n"
+)
+
 
 @pytest.fixture
 def mx():
@@ -63,8 +90,7 @@ class TestOperationLog:
 
 class TestParseOpLog:
     def test_parse_single_op(self):
-        text = "abc123 admin@host now, lasted 5ms\ninit repo\nargs: jj git init\n"
-        ops = OperationManager._parse_op_log(text)
+        ops = OperationManager._parse_op_log(_SINGLE_OP_LOG)
         assert len(ops) == 1
         assert ops[0].id == "abc123"
         assert ops[0].description == "init repo"
@@ -72,16 +98,7 @@ class TestParseOpLog:
         assert ops[0].tags == "jj git init"
 
     def test_parse_multiple_ops_separated_by_blank_lines(self):
-        text = (
-            "op1 u1@host 1 second ago, lasted 10ms\n"
-            "first operation\n"
-            "args: jj new\n"
-            "\n"
-            "op2 u2@host 2 seconds ago, lasted 12ms\n"
-            "second operation\n"
-            "args: jj describe\n"
-        )
-        ops = OperationManager._parse_op_log(text)
+        ops = OperationManager._parse_op_log(_TWO_OP_LOG)
         assert len(ops) == 2
         assert ops[0].id == "op1"
         assert ops[0].description == "first operation"
@@ -108,21 +125,7 @@ class TestParseOpLog:
         assert OperationManager._parse_op_log("   \n\n  ") == []
 
     def test_parse_realistic_output(self):
-        text = (
-            "0d76c1c221bd user@host now, lasted 13ms\n"
-            "new empty commit\n"
-            "args: jj new -m second\n"
-            "\n"
-            "4590b0888d6d user@host now, lasted 12ms\n"
-            "describe commit 8990ccc60928\n"
-            "args: jj describe -m 'first change'\n"
-            "\n"
-            "2d0032df3df2 user@host now, lasted 12ms\n"
-            "add workspace 'default'\n"
-            "\n"
-            "000000000000 root()\n"
-        )
-        ops = OperationManager._parse_op_log(text)
+        ops = OperationManager._parse_op_log(_REALISTIC_OP_LOG)
         assert len(ops) == 4
         assert ops[0].id == "0d76c1c221bd"
         assert ops[0].description == "new empty commit"
@@ -131,6 +134,36 @@ class TestParseOpLog:
         assert ops[3].id == "000000000000"
 
 
+class TestOpLogParser:
+    def test_emits_operation_at_blank_line(self):
+        parser = _OpLogParser()
+        for line in ["op1 u@host now", "first", "args: jj new"]:
+            parser.feed_line(line)
+        assert parser.operations == []
+        parser.feed_line("")
+        assert [op.id for op in parser.operations] == ["op1"]
+        parser.feed_line("000000000000 root()")
+        assert [op.id for op in parser.close()] == ["op1", "000000000000"]
+
+    def test_whitespace_only_lines_end_a_block(self):
+        text = (
+            "op1 u@host 2 minutes ago\n"
+            "first line\n"
+            "second line\n"
+            "args: jj describe\n"
+            "  \n"
+            "\n"
+            "000000000000 root()\n"
+        )
+        parser = _OpLogParser()
+        for line in text.splitlines():
+            parser.feed_line(line)
+        streamed = parser.close()
+        assert [op.id for op in streamed] == ["op1", "000000000000"]
+        assert streamed[0].description == "first line\nsecond line"
+        assert streamed[0].time == "2 minutes ago"
+
+
 class TestOperationRestore:
     @pytest.mark.asyncio
     async def test_restore(self, om):
@@ -5,7 +5,7 @@ import json
 from jj._parsing import (
     CHANGE_LIST_TEMPLATE,
     CHANGE_TEMPLATE,
-    SEPARATOR,
+    ChangeStreamParser,
     parse_change,
     parse_changes,
 )
@@ -22,12 +22,9 @@ class TestTemplateConstants:
         assert isinstance(CHANGE_LIST_TEMPLATE, str)
         assert len(CHANGE_LIST_TEMPLATE) > 0
 
-    def test_separator_is_nonempty(self):
-        assert isinstance(SEPARATOR, str)
-        assert len(SEPARATOR) > 0
-
-    def test_list_template_contains_separator(self):
-        assert SEPARATOR in CHANGE_LIST_TEMPLATE
+    def test_list_template_ends_each_record_with_newline(self):
+        assert CHANGE_LIST_TEMPLATE.startswith(CHANGE_TEMPLATE)
+        assert CHANGE_LIST_TEMPLATE.endswith(' ++ "\\n"')
 
 
 class TestParseChange:
@@ -62,8 +59,23 @@ class TestParseChanges:
         result = parse_changes(changes_stdout(c1, c2, c3))
         assert [c.change_id for c in result] == ["first", "second", "third"]
 
-    def test_trailing_separator_ignored(self):
+    def test_blank_lines_ignored(self):
         data = make_change_json(change_id="trail")
-        text = json.dumps(data) + "<<JJ_SEP>>"
+        text = "\n" + json.dumps(data) + "\n  \n"
         result = parse_changes(text)
         assert len(result) == 1
+
+
+class TestChangeStreamParser:
+    def test_emits_one_change_per_line(self):
+        parser = ChangeStreamParser()
+        parser.feed_line(change_stdout(make_change_json(change_id="first")))
+        assert [c.change_id for c in parser.changes] == ["first"]
+        parser.feed_line(change_stdout(make_change_json(change_id="second")))
+        assert [c.change_id for c in parser.close()] == ["first", "second"]
+
+    def test_skips_blank_lines(self):
+        parser = ChangeStreamParser()
+        parser.feed_line("")
+        parser.feed_line("   ")
+        assert parser.close() == []
@@ -1,10 +1,16 @@
 """Tests for Repo core methods — verifies args passed to executor and parsed returns."""
 
+import asyncio
+import contextlib
+from unittest.mock import patch
+
 import pytest
 
-from jj.repo import Status
+from jj.errors import JJCommandError
+from jj.repo import _ILOG_BUFFER, Status
 
 from .conftest import (
+    BatchExecutor,
     MockExecutor,
     change_stdout,
     changes_stdout,
@@ -31,28 +37,21 @@ class TestLog:
         await rp.log()
         cmd = mx.calls[0]
         assert "log" in cmd
-        assert "-r" in cmd
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "@"
+        assert mx.last_flags["-r"] == "@"
 
     @pytest.mark.asyncio
     async def test_log_custom_revset(self, mx, rp):
         c = make_change_json(change_id="log2")
         mx.queue(stdout=changes_stdout(c))
         await rp.log(revset="main..@")
-        cmd = mx.calls[0]
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "main..@"
+        assert mx.last_flags["-r"] == "main..@"
 
     @pytest.mark.asyncio
     async def test_log_with_limit(self, mx, rp):
         c = make_change_json()
         mx.queue(stdout=changes_stdout(c))
         await rp.log(limit=5)
-        cmd = mx.calls[0]
-        assert "-n" in cmd
-        idx = cmd.index("-n")
-        assert cmd[idx + 1] == "5"
+        assert mx.last_flags["-n"] == "5"
 
     @pytest.mark.asyncio
     async def test_log_returns_changes(self, mx, rp):
@@ -71,17 +70,71 @@ class TestLog:
         assert result == []
 
 
+class TestIlog:
+    @pytest.mark.asyncio
+    async def test_yields_changes_in_order(self, mx, rp):
+        c1 = make_change_json(change_id="a")
+        c2 = make_change_json(change_id="b")
+        mx.queue(stdout=changes_stdout(c1, c2))
+        result = [c.change_id async for c in rp.ilog(revset="all()", limit=2)]
+        assert result == ["a", "b"]
+        assert mx.last_flags["-r"] == "all()"
+        assert mx.last_flags["-n"] == "2"
+
+    @pytest.mark.asyncio
+    async def test_raises_command_error(self, mx, rp):
+        mx.queue(returncode=1, stderr="bad revset")
+        with pytest.raises(JJCommandError):
+            async for _ in rp.ilog(revset="nope("):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_early_exit_stops_command(self):
+        cancelled = asyncio.Event()
+
+        class SlowExecutor(MockExecutor):
+            async def stream(self, cmd, *, on_stdout_line=None, on_stderr_line=None):
+                await on_stdout_line(changes_stdout(make_change_json()).rstrip("\n"))
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+        sx = SlowExecutor()
+        async with contextlib.aclosing(make_repo(sx).ilog()) as changes:
+            async for _ in changes:
+                break
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_pauses_command(self):
+        produced = 0
+
+        class EagerExecutor(MockExecutor):
+            async def stream(self, cmd, *, on_stdout_line=None, on_stderr_line=None):
+                nonlocal produced
+                line = changes_stdout(make_change_json()).rstrip("\n")
+                for _ in range(1000):
+                    await on_stdout_line(line)
+                    produced += 1
+                return await self.execute(cmd)
+
+        async with contextlib.aclosing(make_repo(EagerExecutor()).ilog()) as changes:
+            async for _ in changes:
+                await asyncio.sleep(0.01)
+                break
+        assert produced <= _ILOG_BUFFER + 1
+
+
 class TestShow:
     @pytest.mark.asyncio
     async def test_show_default_rev(self, mx, rp):
         c = make_change_json(change_id="show1")
         mx.queue(stdout=change_stdout(c))
         result = await rp.show()
-        cmd = mx.calls[0]
-        assert "-r" in cmd
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "@"
-        assert "-n" in cmd
+        assert mx.last_flags["-r"] == "@"
+        assert mx.last_flags["-n"] == "1"
         assert result.change_id == "show1"
 
     @pytest.mark.asyncio
@@ -89,9 +142,7 @@ class TestShow:
         c = make_change_json(change_id="show2")
         mx.queue(stdout=change_stdout(c))
         await rp.show("abc")
-        cmd = mx.calls[0]
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "abc"
+        assert mx.last_flags["-r"] == "abc"
 
 
 class TestDiff:
@@ -108,10 +159,7 @@ class TestDiff:
     async def test_diff_with_revision(self, mx, rp):
         mx.queue(stdout="")
         await rp.diff(revision="abc")
-        cmd = mx.calls[0]
-        assert "-r" in cmd
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "abc"
+        assert mx.last_flags["-r"] == "abc"
 
     @pytest.mark.asyncio
     async def test_diff_with_from_to(self, mx, rp):
@@ -152,6 +200,109 @@ class TestStatus:
         # Two calls: show + diff
         assert len(mx.calls) == 2
 
+    @pytest.mark.asyncio
+    async def test_status_runs_show_and_diff_concurrently(self):
+        class OverlapExecutor(MockExecutor):
+            in_flight = 0
+            peak = 0
+
+            async def execute(self, cmd):
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(0)
+                self.in_flight -= 1
+                return await super().execute(cmd)
+
+        ox = OverlapExecutor()
+        ox.queue(stdout=change_stdout(make_change_json()))
+        ox.queue(stdout="")
+        await make_repo(ox).status()
+        assert ox.peak == 2
+
+
+class TestWorkingCopyCache:
+    @pytest.fixture
+    def cached(self, mx):
+        return make_repo(mx, working_copy_ttl=60)
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, mx, rp):
+        mx.queue(stdout=change_stdout(make_change_json()))
+        mx.queue(stdout=change_stdout(make_change_json()))
+        await rp.show("@")
+        await rp.show("@")
+        assert len(mx.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_status_then_show_reuses_working_copy(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json(change_id="wc")))
+        mx.queue(stdout="")
+        status = await cached.status()
+        assert await cached.show() is status.working_copy
+        assert len(mx.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_other_revisions_not_cached(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json()))
+        mx.queue(stdout=change_stdout(make_change_json()))
+        await cached.show("@-")
+        await cached.show("@-")
+        assert len(mx.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_mutation_invalidates(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json(change_id="before")))
+        mx.queue(stdout="")  # abandon
+        mx.queue(stdout=change_stdout(make_change_json(change_id="after")))
+        await cached.show()
+        await cached.abandon("x")
+        assert (await cached.show()).change_id == "after"
+
+    @pytest.mark.asyncio
+    async def test_manager_mutation_invalidates(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json()))
+        mx.queue(stdout="")  # bookmark create
+        mx.queue(stdout=change_stdout(make_change_json(bookmarks=["b"])))
+        await cached.show()
+        await cached.bookmark.create("b")
+        assert (await cached.show()).bookmarks == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_push_invalidates(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json()))
+        mx.queue(stderr="Creating bookmark push-abc for revision abc\n")  # push -c @
+        mx.queue(stdout=change_stdout(make_change_json(bookmarks=["push-abc"])))
+        await cached.show("@")
+        await cached.git.push(change="@")
+        assert (await cached.show("@")).bookmarks == ["push-abc"]
+
+    @pytest.mark.asyncio
+    async def test_queries_keep_cache(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json()))
+        await cached.show("@")
+        await cached.diff()
+        await cached.log(revset="@-")
+        await cached.show("@")
+        assert len(mx.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_new_primes_cache(self, mx, cached):
+        mx.queue(stdout="")
+        mx.queue(stdout=change_stdout(make_change_json(change_id="n")))
+        created = await cached.new()
+        assert await cached.show() is created
+        assert len(mx.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_expires_after_ttl(self, mx, cached):
+        mx.queue(stdout=change_stdout(make_change_json()))
+        mx.queue(stdout=change_stdout(make_change_json()))
+        with patch("jj.repo.time.monotonic", return_value=100.0):
+            await cached.show()
+        with patch("jj.repo.time.monotonic", return_value=161.0):
+            await cached.show()
+        assert len(mx.calls) == 2
+
 
 class TestFileList:
     @pytest.mark.asyncio
@@ -167,10 +318,7 @@ class TestFileList:
     async def test_file_list_with_revision(self, mx, rp):
         mx.queue(stdout="a.py\n")
         await rp.file_list(revision="main")
-        cmd = mx.calls[0]
-        assert "-r" in cmd
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "main"
+        assert mx.last_flags["-r"] == "main"
 
     @pytest.mark.asyncio
     async def test_file_list_empty(self, mx, rp):
@@ -226,6 +374,16 @@ class TestNew:
         await rp.new("x", insert_after=True)
         assert "--insert-after" in mx.calls[0]
 
+    @pytest.mark.asyncio
+    async def test_new_and_show_share_one_batch(self):
+        bx = BatchExecutor()
+        bx.queue(stdout="")
+        bx.queue(stdout=change_stdout(make_change_json(change_id="new1")))
+        result = await make_repo(bx).new()
+        assert len(bx.batches) == 1
+        assert result.change_id == "new1"
+        assert bx.calls[1][-4:] == ["-r", "@", "-n", "1"]
+
 
 class TestDescribe:
     @pytest.mark.asyncio
@@ -319,10 +477,7 @@ class TestSplit:
     async def test_split_with_revision(self, mx, rp):
         mx.queue(stdout="")
         await rp.split(revision="abc", files=["x.py"])
-        cmd = mx.calls[0]
-        assert "-r" in cmd
-        idx = cmd.index("-r")
-        assert cmd[idx + 1] == "abc"
+        assert mx.last_flags["-r"] == "abc"
 
 
 class TestRebase:
@@ -332,27 +487,18 @@ class TestRebase:
         await rp.rebase(destination="main")
         cmd = mx.calls[0]
         assert "rebase" in cmd
-        assert "-d" in cmd
-        idx = cmd.index("-d")
-        assert cmd[idx + 1] == "main"
-
-    @pytest.mark.asyncio
-    async def test_rebase_with_revision(self, mx, rp):
-        mx.queue(stdout="")
-        await rp.rebase(revision="abc", destination="main")
-        assert "-r" in mx.calls[0]
+        assert mx.last_flags["-d"] == "main"
 
     @pytest.mark.asyncio
-    async def test_rebase_with_source(self, mx, rp):
+    @pytest.mark.parametrize(
+        ("kwarg", "flag"),
+        [("revision", "-r"), ("source", "-s"), ("branch", "-b")],
+    )
+    async def test_rebase_selector(self, mx, rp, kwarg, flag):
         mx.queue(stdout="")
-        await rp.rebase(source="abc", destination="main")
-        assert "-s" in mx.calls[0]
-
-    @pytest.mark.asyncio
-    async def test_rebase_with_branch(self, mx, rp):
-        mx.queue(stdout="")
-        await rp.rebase(branch="feature", destination="main")
-        assert "-b" in mx.calls[0]
+        await rp.rebase(**{kwarg: "abc"}, destination="main")
+        assert mx.last_flags[flag] == "abc"
+        assert mx.last_flags["-d"] == "main"
 
 
 class TestAbandon:
@@ -412,6 +558,19 @@ class TestDuplicate:
         assert "abc" in cmd
         assert "def" in cmd
 
+    @pytest.mark.asyncio
+    async def test_duplicate_logs_reported_ids(self, mx, rp):
+        c1 = make_change_json(change_id="d1")
+        c2 = make_change_json(change_id="d2")
+        mx.queue(
+            stderr="Duplicated 1a2b3c4d as d1 5e6f7a8b (empty) one\n"
+            "Duplicated 9c0d1e2f as d2 3a4b5c6d two\n"
+        )
+        mx.queue(stdout=changes_stdout(c1, c2))
+        result = await rp.duplicate("abc", "def")
+        assert mx.last_flags["-r"] == "d1|d2"
+        assert [c.change_id for c in result] == ["d1", "d2"]
+
 
 class TestUndo:
     @pytest.mark.asyncio
@@ -421,6 +580,19 @@ class TestUndo:
         assert mx.calls[0][-1] == "undo"
 
 
+class TestWarmup:
+    @pytest.mark.asyncio
+    async def test_warmup_runs_version(self, mx, rp):
+        mx.queue(stdout="jj 0.25.0\n")
+        await rp.warmup()
+        assert mx.calls[0][-1] == "--version"
+
+    @pytest.mark.asyncio
+    async def test_warmup_ignores_failure(self, mx, rp):
+        mx.queue(returncode=1, stderr="boom")
+        await rp.warmup()
+
+
 class TestRun:
     @pytest.mark.asyncio
     async def test_run_escape_hatch(self, mx, rp):
@@ -5,10 +5,11 @@ from unittest.mock import patch
 
 import pytest
 
-from jj._runner import Runner
+from jj._executor import LocalExecutor
+from jj._runner import Runner, clear_jj_cache
 from jj.errors import JJCommandError, JJNotFoundError, JJRepoNotFoundError
 
-from .conftest import MockExecutor, make_runner
+from .conftest import BatchExecutor, MockExecutor, make_runner
 
 
 class TestRunnerInit:
@@ -24,6 +25,31 @@ class TestRunnerInit:
                 Runner(jj_path="/nonexistent/jj")
             assert exc_info.value.jj_path == "/nonexistent/jj"
 
+    def test_resolution_is_cached(self):
+        with patch("jj._runner.shutil.which", return_value="/usr/bin/jj") as which:
+            Runner(jj_path="jj")
+            Runner(jj_path="jj")
+        which.assert_called_once_with("jj")
+
+    def test_clear_jj_cache_forces_lookup(self):
+        with patch("jj._runner.shutil.which", return_value="/usr/bin/jj") as which:
+            Runner(jj_path="jj")
+            clear_jj_cache()
+            Runner(jj_path="jj")
+        assert which.call_count == 2
+
+    def test_custom_executor_skips_lookup(self):
+        with patch("jj._runner.shutil.which", return_value=None) as which:
+            Runner(jj_path="jj", executor=MockExecutor())
+        which.assert_not_called()
+
+    def test_default_executor_is_shared(self):
+        with patch("jj._runner.shutil.which", return_value="/usr/bin/jj"):
+            a = Runner(jj_path="jj")
+            b = Runner(jj_path="jj")
+        assert isinstance(a.executor, LocalExecutor)
+        assert a.executor is b.executor
+
     def test_succeeds_when_binary_found(self):
         mock = MockExecutor()
         runner = make_runner(mock)
@@ -129,3 +155,145 @@ class TestRunnerRepoNotFound:
         with pytest.raises(JJCommandError) as exc_info:
             await runner.run(["log"])
         assert not isinstance(exc_info.value, JJRepoNotFoundError)
+
+
+class TestRunnerRunMany:
+    @pytest.mark.asyncio
+    async def test_returns_results_in_order(self):
+        mock = MockExecutor()
+        mock.queue(stdout="first")
+        mock.queue(stdout="second")
+        runner = make_runner(mock)
+        results = await runner.run_many(
+            [["bookmark", "list"], ["git", "remote", "list"]]
+        )
+        assert [r.stdout for r in results] == ["first", "second"]
+        assert mock.calls == [
+            ["jj", "--no-pager", "--color", "never", "bookmark", "list"],
+            ["jj", "--no-pager", "--color", "never", "git", "remote", "list"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_check_raises_on_any_failure(self):
+        mock = MockExecutor()
+        mock.queue(stdout="ok")
+        mock.queue(returncode=1, stderr="boom")
+        runner = make_runner(mock)
+        with pytest.raises(JJCommandError) as exc_info:
+            await runner.run_many([["log"], ["bad-cmd"]])
+        assert exc_info.value.command[-1] == "bad-cmd"
+
+    @pytest.mark.asyncio
+    async def test_check_false_returns_failures(self):
+        mock = MockExecutor()
+        mock.queue(returncode=1, stderr="boom")
+        runner = make_runner(mock)
+        results = await runner.run_many([["bad-cmd"]], check=False)
+        assert results[0].returncode == 1
+
+    @pytest.mark.asyncio
+    async def test_uses_execute_many_when_available(self):
+        mock = BatchExecutor()
+        runner = make_runner(mock)
+        await runner.run_many([["log"], ["status"]])
+        assert len(mock.batches) == 1
+        assert [cmd[-1] for cmd in mock.batches[0]] == ["log", "status"]
+
+
+class TestRunnerRunSequence:
+    @pytest.mark.asyncio
+    async def test_runs_in_order_and_stops_at_failure(self):
+        mock = MockExecutor()
+        mock.queue(returncode=1, stderr="boom")
+        mock.queue(stdout="never")
+        runner = make_runner(mock)
+        with pytest.raises(JJCommandError):
+            await runner.run_sequence([["new"], ["log"]])
+        assert len(mock.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_uses_execute_many_when_available(self):
+        mock = BatchExecutor()
+        mock.queue(stdout="")
+        mock.queue(stdout="shown")
+        runner = make_runner(mock)
+        results = await runner.run_sequence([["new"], ["log"]])
+        assert len(mock.batches) == 1
+        assert results[1].stdout == "shown"
+
+
+class TestRunnerMutations:
+    @pytest.mark.asyncio
+    async def test_counts_commands_unless_read_only(self, runner):
+        await runner.run(["git", "fetch"])
+        await runner.run(["bookmark", "set", "x"], capture_stdout=False)
+        await runner.run(["log"], read_only=True)
+        await runner.run_stream(["op", "log"], read_only=True)
+        assert runner.mutations == 2
+
+
+class TestRunnerCaptureStdout:
+    @pytest.mark.asyncio
+    async def test_uses_execute_quiet_when_available(self):
+        class QuietExecutor(MockExecutor):
+            def __init__(self) -> None:
+                super().__init__()
+                self.quiet: list[list[str]] = []
+
+            async def execute_quiet(self, cmd):
+                self.quiet.append(cmd)
+                return await self.execute(cmd)
+
+        mock = QuietExecutor()
+        runner = make_runner(mock)
+        await runner.run(["bookmark", "create", "x"], capture_stdout=False)
+        await runner.run(["log"])
+        assert [cmd[-1] for cmd in mock.quiet] == ["x"]
+        assert len(mock.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_plain_executor_called_without_flag(self):
+        mock = MockExecutor()
+        mock.queue(stdout="ignored")
+        runner = make_runner(mock)
+        result = await runner.run(["bookmark", "create", "x"], capture_stdout=False)
+        assert result.returncode == 0
+        assert mock.calls[0][-1] == "x"
+
+
+class TestRunnerRunStream:
+    @pytest.mark.asyncio
+    async def test_replays_lines_without_stream_support(self):
+        mock = MockExecutor()
+        mock.queue(stdout="a\nb\n", stderr="warn\n")
+        runner = make_runner(mock)
+        out: list[str] = []
+        err: list[str] = []
+        result = await runner.run_stream(
+            ["log"], on_stdout_line=out.append, on_stderr_line=err.append
+        )
+        assert out == ["a", "b"]
+        assert err == ["warn"]
+        assert result.stdout == "a\nb\n"
+
+    @pytest.mark.asyncio
+    async def test_uses_executor_stream(self):
+        class StreamingExecutor(MockExecutor):
+            async def stream(self, cmd, *, on_stdout_line=None, on_stderr_line=None):
+                on_stdout_line("live")
+                return await self.execute(cmd)
+
+        mock = StreamingExecutor()
+        runner = make_runner(mock)
+        out: list[str] = []
+        await runner.run_stream(["log"], on_stdout_line=out.append)
+        assert out == ["live"]
+        assert mock.calls[0][-1] == "log"
+
+    @pytest.mark.asyncio
+    async def test_check_raises(self):
+        mock = MockExecutor()
+        mock.queue(returncode=1, stderr="There is no jj repo in /x")
+        runner = make_runner(mock)
+        with pytest.raises(JJRepoNotFoundError):
+            await runner.run_stream(["log"])
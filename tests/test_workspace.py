@@ -2,6 +2,8 @@
 
 import pytest
 
+from jj._parsing import WORKSPACE_TEMPLATE
+
 from .conftest import MockExecutor, make_repo
 
 
@@ -63,11 +65,18 @@ class TestWorkspaceList:
     @pytest.mark.asyncio
     async def test_list_parses_names(self, wm):
         mgr, mx = wm
-        mx.queue(
-            stdout="default: abc123 (no description)\nsecond: def456 (my workspace)\n"
-        )
+        mx.queue(stdout='"default"\n"second"\n')
         result = await mgr.list()
         assert result == ["default", "second"]
+        cmd = mx.calls[0]
+        assert cmd[cmd.index("-T") + 1] == WORKSPACE_TEMPLATE
+
+    @pytest.mark.asyncio
+    async def test_list_name_with_colon(self, wm):
+        mgr, mx = wm
+        mx.queue(stdout='"team: main"\n')
+        result = await mgr.list()
+        assert result == ["team: main"]
 
     @pytest.mark.asyncio
     async def test_list_empty(self, wm):